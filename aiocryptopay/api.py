@@ -1,6 +1,7 @@
+from __future__ import annotations
+
 from .base import BaseClient
 from .const import (
-    HTTPMethods,
     Networks,
     Assets,
     PaidButtons,
@@ -9,25 +10,59 @@ from .const import (
     CheckStatus,
 )
 
-from .models.profile import Profile
-from .models.balance import Balance
-from .models.rates import ExchangeRate
-from .models.currencies import Currency
-from .models.invoice import Invoice
-from .models.transfer import Transfer
-from .models.update import Update
-from .models.check import Check
-from .models.app_stats import AppStats
-
-from .utils.exchange import get_rate, get_rate_summ
-
+from . import models
+from .endpoints import ENDPOINTS
+
+from .utils.exchange import RateMatrix, get_rate_summ
+from .utils.batch import BatchResult, run_batch
+from .utils.cache import TTLCache
+from .utils.concurrency import chunked, gather_limited
+from .utils.dedup import BaseDedupStorage, MemoryDedupStorage
+from .utils.dispatcher import UpdateDispatcher
+from .utils.pagination import paginate
+from .utils.rates_cache import ExchangeRatesCache
+from .utils.snapshot import PathLike, read_snapshot, write_snapshot
+
+import asyncio
+import time
 from datetime import datetime
-from hmac import HMAC
+from hmac import HMAC, compare_digest
 from hashlib import sha256
-from typing import Optional, Union, List, Callable
+from yarl import URL
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Union,
+    List,
+    Callable,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from aiohttp import TCPConnector
+    from aiohttp.web import Request, Response
+
+    from .utils.metrics import BaseMetrics
 
-from aiohttp.web import Response
-from aiohttp.web_request import Request
+    from .models import (
+        AppStats,
+        Balance,
+        Check,
+        Currency,
+        ExchangeRate,
+        Invoice,
+        Profile,
+        Transfer,
+        Update,
+    )
+
+
+T = TypeVar("T")
 
 
 class AioCryptoPay(BaseClient):
@@ -38,41 +73,182 @@ class AioCryptoPay(BaseClient):
     """
 
     API_DOCS = "https://help.crypt.bot/crypto-pay-api"
+    MAX_IDS_PER_REQUEST = 1000
+    READ_ENDPOINTS = frozenset(
+        endpoint.name for endpoint in ENDPOINTS.values() if endpoint.read
+    )
+    IDEMPOTENT_ENDPOINTS = frozenset(
+        endpoint.name for endpoint in ENDPOINTS.values() if endpoint.idempotent
+    )
 
     def __init__(
-        self, token: str, network: Union[str, Networks] = Networks.MAIN_NET
+        self,
+        token: str,
+        network: Union[str, Networks] = Networks.MAIN_NET,
+        rates_ttl: float = 60,
+        rates_max_staleness: float = 300,
+        rate_limit: Optional[float] = None,
+        rate_limit_burst: Optional[float] = None,
+        endpoint_rate_limits: Optional[Dict[str, float]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 10,
+        connector: Optional[TCPConnector] = None,
+        connector_limit: int = 100,
+        connector_limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        ttl_dns_cache: Optional[int] = 10,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+        trusted: bool = False,
+        dispatch_workers: Optional[int] = None,
+        dispatch_queue_size: int = 1000,
+        dispatch_drain_timeout: Optional[float] = 30,
+        dedup_updates: bool = True,
+        dedup_storage: Optional[BaseDedupStorage] = None,
+        invoice_cache_size: int = 0,
+        invoice_cache_ttl: Optional[float] = 60,
+        metrics: Optional[BaseMetrics] = None,
+        timeout: Optional[float] = None,
+        endpoint_timeouts: Optional[Dict[str, float]] = None,
+        circuit_breaker_threshold: Optional[int] = None,
+        circuit_breaker_timeout: float = 30,
+        hedge_quantile: Optional[float] = None,
     ) -> None:
-        super().__init__()
+        super().__init__(
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            endpoint_rate_limits=endpoint_rate_limits,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            retry_backoff_max=retry_backoff_max,
+            connector=connector,
+            connector_limit=connector_limit,
+            connector_limit_per_host=connector_limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=ttl_dns_cache,
+            json_loads=json_loads,
+            trusted=trusted,
+            metrics=metrics,
+            timeout=timeout,
+            endpoint_timeouts=endpoint_timeouts,
+            circuit_breaker_threshold=circuit_breaker_threshold,
+            circuit_breaker_timeout=circuit_breaker_timeout,
+            hedge_quantile=hedge_quantile,
+        )
         """
         Init CryptoPay API client
             :param token: Your API token from @CryptoBot
             :param network: Network address https://help.crypt.bot/crypto-pay-api#HYA3
+            :param rates_ttl: Seconds during which cached exchange rates are used by get_amount_by_fiat
+            :param rates_max_staleness: Seconds after which cached exchange rates are never used.
+                Stale rates younger than this are served while a refresh runs in the background.
+            :param rate_limit: Max requests per second, unlimited by default
+            :param rate_limit_burst: Max requests sent at once before rate_limit applies
+            :param endpoint_rate_limits: Max requests per second by API method name, e.g. {"createInvoice": 5}
+            :param max_retries: Retries on rate limit, 5xx and connection errors.
+                Only read and delete methods and transfers (thanks to spend_id) are retried.
+            :param retry_backoff: Base delay of the exponential backoff in seconds
+            :param retry_backoff_max: Max delay between retries in seconds
+            :param connector: Connector shared between clients, see aiocryptopay.base.create_connector.
+                It needs a running event loop, create it and the clients sharing it inside a coroutine.
+            :param connector_limit: Total number of simultaneous connections, 0 for unlimited
+            :param connector_limit_per_host: Simultaneous connections to one host, 0 for unlimited
+            :param keepalive_timeout: Seconds an idle connection is kept in the pool
+            :param ttl_dns_cache: Seconds DNS lookups are cached, None to cache forever
+            :param json_loads: JSON backend, e.g. orjson.loads. By default responses are parsed by pydantic straight from bytes.
+            :param trusted: Skip validation of API responses. Methods return lazy records instead of models,
+                each field is converted on its first access. Call `to_model()` on a record to get the model.
+            :param dispatch_workers: Number of worker tasks running pay handlers in the background.
+                By default handlers are awaited before the webhook response. With workers
+                updates are queued and the webhook is acked right away.
+            :param dispatch_queue_size: Max queued updates, the webhook response waits while the queue is full
+            :param dispatch_drain_timeout: Max seconds `close` waits for queued updates to be handled,
+                then the rest are dropped and running handlers are cancelled. None to wait forever.
+            :param dedup_updates: Ack webhook retries with an already seen update_id without running the handlers
+            :param dedup_storage: Storage of seen update IDs, in-process MemoryDedupStorage by default
+            :param invoice_cache_size: Max invoices kept in the local invoice cache, 0 disables it.
+                Created invoices, fetched invoices and webhook payloads are written to it,
+                get_invoices by IDs reads from it.
+            :param invoice_cache_ttl: Seconds an invoice is kept in the cache, None to keep until evicted by size
+            :param metrics: Request instrumentation, e.g. aiocryptopay.utils.Metrics. Export it with
+                `crypto.metrics.to_prometheus()`. Disabled by default.
+            :param timeout: Total seconds per request attempt, 5 minutes by default
+            :param endpoint_timeouts: Total seconds per request attempt by API method name, e.g. {"getInvoices": 10}
+            :param circuit_breaker_threshold: Consecutive 5xx, connection errors or timeouts after which
+                requests fail fast with aiocryptopay.exceptions.CircuitOpenError. Disabled by default.
+            :param circuit_breaker_timeout: Seconds requests fail fast before a probe request is let through
+            :param hedge_quantile: Quantile of recent latency, e.g. 0.95. A read request slower than it
+                is sent once more and the first response wins. Disabled by default.
         """
         self.__token = token
         self.network = network
         self.__headers = {"Crypto-Pay-API-Token": token}
+        self.__signature_hmac = HMAC(
+            key=sha256(token.encode("UTF-8")).digest(), digestmod=sha256
+        )
         self._handlers = []
-
-    async def get_me(self) -> Profile:
+        self._rates_cache = ExchangeRatesCache(
+            fetcher=self.get_exchange_rates,
+            ttl=rates_ttl,
+            max_staleness=rates_max_staleness,
+        )
+        self._dispatcher = (
+            UpdateDispatcher(
+                handlers=self._handlers,
+                workers=dispatch_workers,
+                queue_size=dispatch_queue_size,
+            )
+            if dispatch_workers
+            else None
+        )
+        self._invoice_cache: Optional[TTLCache[int, Invoice]] = (
+            TTLCache(maxsize=invoice_cache_size, ttl=invoice_cache_ttl)
+            if invoice_cache_size
+            else None
+        )
+        self._dispatch_drain_timeout = dispatch_drain_timeout
+        self._dedup_storage = (
+            (dedup_storage or MemoryDedupStorage()) if dedup_updates else None
+        )
+        # Last results of get_me and get_currencies, also restored by load_snapshot
+        self.profile: Optional[Profile] = None
+        self.currencies: Optional[List[Currency]] = None
+        self._profile_fetched_at: Optional[float] = None
+        self._currencies_fetched_at: Optional[float] = None
+
+    @property
+    def network(self) -> Union[str, Networks]:
+        return self._network
+
+    @network.setter
+    def network(self, network: Union[str, Networks]) -> None:
+        self._network = network
+        self._urls = {name: URL(f"{network}/api/{name}") for name in ENDPOINTS}
+
+    async def get_me(self, coalesce: bool = True) -> Profile:
         """
         Use this method to test your app's authentication token. Requires no parameters. On success, returns basic information about an app.
         https://help.crypt.bot/crypto-pay-api#getMe
 
+        Args:
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
         Returns:
             Profile: App profile
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getMe"
-
-        response = await self._make_request(
-            method=method, url=url, headers=self.__headers
+        self.profile = await self._call(
+            "getMe",
+            result_type=models.Profile,
+            coalesce=coalesce,
         )
-        return Profile(**response["result"])
+        self._profile_fetched_at = time.time()
+        return self.profile
 
     async def get_stats(
         self,
         start_at: Optional[Union[datetime, str]] = None,
         end_at: Optional[Union[datetime, str]] = None,
+        coalesce: bool = True,
     ) -> AppStats:
         """
         Use this method to get app statistics.
@@ -81,76 +257,75 @@ class AioCryptoPay(BaseClient):
         Args:
             start_at: (Optional[Union[datetime, str]]): Date from which start calculating statistics in ISO 8601 format. Defaults is current date minus 24 hours.
             end_at: (Optional[Union[datetime, str]]): The date on which to finish calculating statistics in ISO 8601 format. Defaults is current date.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
 
         Returns:
             AppStats: AppStats object
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getStats"
-
         params = {
             "start_at": start_at,
             "end_at": end_at,
         }
 
-        for key, value in params.copy().items():
-            if isinstance(value, datetime):
-                params[key] = str(value)
-            if value is None:
-                del params[key]
-
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        return await self._call(
+            "getStats",
+            params=params,
+            result_type=models.AppStats,
+            coalesce=coalesce,
         )
-        return AppStats(**response["result"])
 
-    async def get_balance(self) -> List[Balance]:
+    async def get_balance(self, coalesce: bool = True) -> List[Balance]:
         """
         Use this method to get a balance of your app.
         https://help.crypt.bot/crypto-pay-api#getBalance
 
+        Args:
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
         Returns:
             List[Balance]: Balances in list
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getBalance"
-
-        response = await self._make_request(
-            method=method, url=url, headers=self.__headers
+        return await self._call(
+            "getBalance",
+            result_type=List[models.Balance],
+            coalesce=coalesce,
         )
-        return [Balance(**balance) for balance in response["result"]]
 
-    async def get_exchange_rates(self) -> List[ExchangeRate]:
+    async def get_exchange_rates(self, coalesce: bool = True) -> List[ExchangeRate]:
         """
         Use this method to get exchange rates of supported currencies. Returns array of currencies.
         https://help.crypt.bot/crypto-pay-api#getExchangeRates
 
+        Args:
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
         Returns:
             List[ExchangeRates]: ExchangeRates in list
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getExchangeRates"
-
-        response = await self._make_request(
-            method=method, url=url, headers=self.__headers
+        return await self._call(
+            "getExchangeRates",
+            result_type=List[models.ExchangeRate],
+            coalesce=coalesce,
         )
-        return [ExchangeRate(**rate) for rate in response["result"]]
 
-    async def get_currencies(self) -> List[Currency]:
+    async def get_currencies(self, coalesce: bool = True) -> List[Currency]:
         """
         Use this method to get a list of supported currencies. Returns array of currencies.
         https://help.crypt.bot/crypto-pay-api#getCurrencies
 
+        Args:
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
         Returns:
             List[Currencies]: Currencies in list
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getCurrencies"
-
-        response = await self._make_request(
-            method=method, url=url, headers=self.__headers
+        self.currencies = await self._call(
+            "getCurrencies",
+            result_type=List[models.Currency],
+            coalesce=coalesce,
         )
-        return [Currency(**currency) for currency in response["result"]]
+        self._currencies_fetched_at = time.time()
+        return self.currencies
 
     async def create_invoice(
         self,
@@ -192,12 +367,6 @@ class AioCryptoPay(BaseClient):
         Returns:
             Invoice: Invoice object
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/createInvoice"
-
-        if accepted_assets and type(accepted_assets) == list:
-            accepted_assets = ",".join(map(str, accepted_assets))
-
         params = {
             "asset": asset,
             "amount": amount,
@@ -215,16 +384,32 @@ class AioCryptoPay(BaseClient):
             "swap_to": swap_to,
         }
 
-        for key, value in params.copy().items():
-            if isinstance(value, bool):
-                params[key] = str(value).lower()
-            if value is None:
-                del params[key]
-
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        invoice = await self._call(
+            "createInvoice",
+            params=params,
+            result_type=models.Invoice,
         )
-        return Invoice(**response["result"])
+        self._cache_invoices([invoice])
+        return invoice
+
+    async def create_invoices(
+        self, specs: Iterable[Dict[str, Any]], concurrency: int = 10
+    ) -> AsyncIterator[BatchResult[Invoice]]:
+        """
+        Create many invoices concurrently.
+        Results are yielded as soon as each invoice is created, a failed item does not stop the batch.
+
+        Args:
+            specs (Iterable[Dict[str, Any]]): create_invoice keyword arguments for every invoice.
+            concurrency (int, optional): Max number of requests in flight. Default is 10.
+
+        Yields:
+            BatchResult[Invoice]: Created invoice or error with the index of its spec
+        """
+        async for result in run_batch(
+            lambda spec: self.create_invoice(**spec), specs, concurrency
+        ):
+            yield result
 
     async def get_invoices(
         self,
@@ -233,26 +418,53 @@ class AioCryptoPay(BaseClient):
         status: Optional[Union[InvoiceStatus, str]] = None,
         offset: Optional[int] = None,
         count: Optional[int] = None,
+        max_age: Optional[float] = None,
+        coalesce: bool = True,
     ) -> Optional[Union[Invoice, List[Invoice]]]:
         """
         Use this method to get invoices of your app.
         https://help.crypt.bot/crypto-pay-api#getInvoices
 
+        With the invoice cache enabled, invoices requested only by IDs are served from the cache
+        and just the missing ones are requested.
+
         Args:
             asset (Optional[Union[Assets, str]], optional): Cryptocurrency alphabetic code. Supported assets: “USDT”, “TON”, “BTC”, “ETH”, “LTC”, “BNB”, “TRX” and “USDC” (and “JET” for testnet). Defaults to all currencies.
             invoice_ids (Optional[Union[List[int], int]], optional): Invoice IDs separated by comma (list in python).
             status (Optional[Union[InvoiceStatus, str]], optional): Status of invoices to be returned. Available statuses: “active” and “paid”. Defaults to all statuses.
             offset (Optional[int], optional): Offset needed to return a specific subset of invoices. Default is 0.
             count (Optional[int], optional): Number of invoices to be returned. Values between 1-1000 are accepted. Default is 100.
+            max_age (Optional[float], optional): Max age in seconds of cached invoices to be returned, 0 to skip the cache. Defaults to the cache TTL.
+            coalesce (bool, optional): Share the response with identical requests in flight, pass False with max_age=0 for the current status. Default is True.
 
         Returns:
             Optional[Union[Invoice, List[Invoice]]]: Invoice object or list of Invoices
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getInvoices"
+        if (
+            self._invoice_cache is not None
+            and invoice_ids
+            and asset is None
+            and status is None
+            and offset is None
+            and count is None
+        ):
+            return await self._get_cached_invoices(invoice_ids, max_age, coalesce)
 
         if invoice_ids and type(invoice_ids) == list:
-            invoice_ids = ",".join(map(str, invoice_ids))
+            if (
+                len(invoice_ids) > self.MAX_IDS_PER_REQUEST
+                and offset is None
+                and count is None
+            ):
+                invoices = await self.get_invoices_by_ids(
+                    invoice_ids=invoice_ids,
+                    asset=asset,
+                    status=status,
+                    coalesce=coalesce,
+                )
+                return list(invoices.values()) or None
+            if count is None:
+                count = len(invoice_ids)
 
         params = {
             "asset": asset,
@@ -262,17 +474,93 @@ class AioCryptoPay(BaseClient):
             "count": count,
         }
 
-        for key, value in params.copy().items():
-            if value is None:
-                del params[key]
-
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        page = await self._call(
+            "getInvoices",
+            params=params,
+            result_type=models.Items[models.Invoice],
+            coalesce=coalesce,
         )
-        if len(response["result"]["items"]) > 0:
+        self._cache_invoices(page.items)
+        if len(page.items) > 0:
             if invoice_ids and isinstance(invoice_ids, int):
-                return Invoice(**response["result"]["items"][0])
-            return [Invoice(**invoice) for invoice in response["result"]["items"]]
+                return page.items[0]
+            return page.items
+
+    async def get_invoices_by_ids(
+        self,
+        invoice_ids: List[int],
+        asset: Optional[Union[Assets, str]] = None,
+        status: Optional[Union[InvoiceStatus, str]] = None,
+        chunk_size: int = MAX_IDS_PER_REQUEST,
+        concurrency: int = 4,
+        coalesce: bool = True,
+    ) -> Dict[int, Invoice]:
+        """
+        Get invoices by any number of IDs.
+        IDs are split into chunks which are requested concurrently.
+
+        Args:
+            invoice_ids (List[int]): Invoice IDs.
+            asset (Optional[Union[Assets, str]], optional): Cryptocurrency alphabetic code. Defaults to all currencies.
+            status (Optional[Union[InvoiceStatus, str]], optional): Status of invoices to be returned. Defaults to all statuses.
+            chunk_size (int, optional): IDs per request. Values between 1-1000 are accepted. Default is 1000.
+            concurrency (int, optional): Max number of requests in flight. Default is 4.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
+        Returns:
+            Dict[int, Invoice]: Found invoices by ID in input order
+        """
+        return await self._get_by_ids(
+            fetch=lambda ids: self.get_invoices(
+                invoice_ids=ids,
+                asset=asset,
+                status=status,
+                count=len(ids),
+                coalesce=coalesce,
+            ),
+            ids=invoice_ids,
+            key="invoice_id",
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+        )
+
+    async def iter_invoices(
+        self,
+        asset: Optional[Union[Assets, str]] = None,
+        status: Optional[Union[InvoiceStatus, str]] = None,
+        offset: int = 0,
+        count: int = 1000,
+        prefetch: int = 2,
+        coalesce: bool = True,
+    ) -> AsyncIterator[Invoice]:
+        """
+        Iterate over all invoices of your app, page by page.
+        Next pages are requested while the current one is consumed.
+
+        Args:
+            asset (Optional[Union[Assets, str]], optional): Cryptocurrency alphabetic code. Defaults to all currencies.
+            status (Optional[Union[InvoiceStatus, str]], optional): Status of invoices to be returned. Defaults to all statuses.
+            offset (int, optional): Offset of the first invoice. Default is 0.
+            count (int, optional): Page size. Values between 1-1000 are accepted. Default is 1000.
+            prefetch (int, optional): Number of pages requested ahead. Default is 2.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
+        Yields:
+            Invoice: Invoice object
+        """
+
+        async def fetch_page(offset: int, count: int) -> List[Invoice]:
+            invoices = await self.get_invoices(
+                asset=asset,
+                status=status,
+                offset=offset,
+                count=count,
+                coalesce=coalesce,
+            )
+            return invoices or []
+
+        async for invoice in paginate(fetch_page, offset, count, prefetch):
+            yield invoice
 
     async def delete_invoice(self, invoice_id: int) -> bool:
         """
@@ -285,15 +573,37 @@ class AioCryptoPay(BaseClient):
         Returns:
             bool: Returns True on success.
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/deleteInvoice"
-
         params = {"invoice_id": invoice_id}
 
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        deleted = await self._call(
+            "deleteInvoice",
+            params=params,
+            result_type=bool,
         )
-        return response["result"]
+        if self._invoice_cache is not None:
+            self._invoice_cache.pop(invoice_id)
+        return deleted
+
+    async def delete_invoices(
+        self, invoice_ids: Iterable[int], concurrency: int = 10
+    ) -> AsyncIterator[BatchResult[bool]]:
+        """
+        Delete many invoices concurrently.
+        Results are yielded as soon as each invoice is deleted, a failed item does not stop the batch.
+
+        Args:
+            invoice_ids (Iterable[int]): Invoice IDs to be deleted.
+            concurrency (int, optional): Max number of requests in flight. Default is 10.
+
+        Yields:
+            BatchResult[bool]: Deletion result or error with the index of its invoice ID
+        """
+        async for result in run_batch(
+            lambda invoice_id: self.delete_invoice(invoice_id=invoice_id),
+            invoice_ids,
+            concurrency,
+        ):
+            yield result
 
     async def transfer(
         self,
@@ -319,9 +629,6 @@ class AioCryptoPay(BaseClient):
         Returns:
             Transfer: Transfer object
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/transfer"
-
         params = {
             "user_id": user_id,
             "asset": asset,
@@ -331,16 +638,11 @@ class AioCryptoPay(BaseClient):
             "disable_send_notification": disable_send_notification,
         }
 
-        for key, value in params.copy().items():
-            if isinstance(value, bool):
-                params[key] = str(value).lower()
-            if value is None:
-                del params[key]
-
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        return await self._call(
+            "transfer",
+            params=params,
+            result_type=models.Transfer,
         )
-        return Transfer(**response["result"])
 
     async def get_transfers(
         self,
@@ -348,6 +650,7 @@ class AioCryptoPay(BaseClient):
         transfer_ids: Optional[Union[List[int], int]] = None,
         offset: Optional[int] = None,
         count: Optional[int] = None,
+        coalesce: bool = True,
     ) -> Optional[Union[Transfer, List[Transfer]]]:
         """
         Use this method to get transfers created by your app.
@@ -358,15 +661,23 @@ class AioCryptoPay(BaseClient):
             transfer_ids (Optional[Union[List[int], int]], optional): List of transfer IDs separated by comma (list in python).
             offset (Optional[int], optional): Offset needed to return a specific subset of invoices. Default is 0.
             count (Optional[int], optional): Number of invoices to be returned. Values between 1-1000 are accepted. Default is 100.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
 
         Returns:
             Optional[Union[Transfer, List[Transfer]]]: Transfer object or list of Transfers
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getTransfers"
-
         if transfer_ids and type(transfer_ids) == list:
-            transfer_ids = ",".join(map(str, transfer_ids))
+            if (
+                len(transfer_ids) > self.MAX_IDS_PER_REQUEST
+                and offset is None
+                and count is None
+            ):
+                transfers = await self.get_transfers_by_ids(
+                    transfer_ids=transfer_ids, asset=asset, coalesce=coalesce
+                )
+                return list(transfers.values()) or None
+            if count is None:
+                count = len(transfer_ids)
 
         params = {
             "asset": asset,
@@ -375,17 +686,80 @@ class AioCryptoPay(BaseClient):
             "count": count,
         }
 
-        for key, value in params.copy().items():
-            if value is None:
-                del params[key]
-
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        page = await self._call(
+            "getTransfers",
+            params=params,
+            result_type=models.Items[models.Transfer],
+            coalesce=coalesce,
         )
-        if len(response["result"]["items"]) > 0:
+        if len(page.items) > 0:
             if transfer_ids and isinstance(transfer_ids, int):
-                return Transfer(**response["result"]["items"][0])
-            return [Transfer(**transfer) for transfer in response["result"]["items"]]
+                return page.items[0]
+            return page.items
+
+    async def get_transfers_by_ids(
+        self,
+        transfer_ids: List[int],
+        asset: Optional[Union[Assets, str]] = None,
+        chunk_size: int = MAX_IDS_PER_REQUEST,
+        concurrency: int = 4,
+        coalesce: bool = True,
+    ) -> Dict[int, Transfer]:
+        """
+        Get transfers by any number of IDs.
+        IDs are split into chunks which are requested concurrently.
+
+        Args:
+            transfer_ids (List[int]): Transfer IDs.
+            asset (Optional[Union[Assets, str]], optional): Currency codes separated by comma. Defaults to all assets.
+            chunk_size (int, optional): IDs per request. Values between 1-1000 are accepted. Default is 1000.
+            concurrency (int, optional): Max number of requests in flight. Default is 4.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
+        Returns:
+            Dict[int, Transfer]: Found transfers by ID in input order
+        """
+        return await self._get_by_ids(
+            fetch=lambda ids: self.get_transfers(
+                transfer_ids=ids, asset=asset, count=len(ids), coalesce=coalesce
+            ),
+            ids=transfer_ids,
+            key="transfer_id",
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+        )
+
+    async def iter_transfers(
+        self,
+        asset: Optional[Union[Assets, str]] = None,
+        offset: int = 0,
+        count: int = 1000,
+        prefetch: int = 2,
+        coalesce: bool = True,
+    ) -> AsyncIterator[Transfer]:
+        """
+        Iterate over all transfers created by your app, page by page.
+        Next pages are requested while the current one is consumed.
+
+        Args:
+            asset (Optional[Union[Assets, str]], optional): Currency codes separated by comma. Defaults to all assets.
+            offset (int, optional): Offset of the first transfer. Default is 0.
+            count (int, optional): Page size. Values between 1-1000 are accepted. Default is 1000.
+            prefetch (int, optional): Number of pages requested ahead. Default is 2.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
+        Yields:
+            Transfer: Transfer object
+        """
+
+        async def fetch_page(offset: int, count: int) -> List[Transfer]:
+            transfers = await self.get_transfers(
+                asset=asset, offset=offset, count=count, coalesce=coalesce
+            )
+            return transfers or []
+
+        async for transfer in paginate(fetch_page, offset, count, prefetch):
+            yield transfer
 
     async def create_check(
         self,
@@ -406,9 +780,6 @@ class AioCryptoPay(BaseClient):
         Returns:
             Check: Check object
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/createCheck"
-
         params = {
             "asset": asset,
             "amount": amount,
@@ -416,14 +787,30 @@ class AioCryptoPay(BaseClient):
             "pin_to_username": pin_to_username,
         }
 
-        for key, value in params.copy().items():
-            if value is None:
-                del params[key]
-
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        return await self._call(
+            "createCheck",
+            params=params,
+            result_type=models.Check,
         )
-        return Check(**response["result"])
+
+    async def create_checks(
+        self, specs: Iterable[Dict[str, Any]], concurrency: int = 10
+    ) -> AsyncIterator[BatchResult[Check]]:
+        """
+        Create many checks concurrently.
+        Results are yielded as soon as each check is created, a failed item does not stop the batch.
+
+        Args:
+            specs (Iterable[Dict[str, Any]]): create_check keyword arguments for every check.
+            concurrency (int, optional): Max number of requests in flight. Default is 10.
+
+        Yields:
+            BatchResult[Check]: Created check or error with the index of its spec
+        """
+        async for result in run_batch(
+            lambda spec: self.create_check(**spec), specs, concurrency
+        ):
+            yield result
 
     async def get_checks(
         self,
@@ -432,6 +819,7 @@ class AioCryptoPay(BaseClient):
         status: Optional[Union[CheckStatus, str]] = None,
         offset: Optional[int] = None,
         count: Optional[int] = None,
+        coalesce: bool = True,
     ) -> Check:
         """
         Use this method to get checks created by your app.
@@ -443,15 +831,26 @@ class AioCryptoPay(BaseClient):
             status (Optional[Union[CheckStatus, str]], optional): _description_. Defaults to None.
             offset (Optional[int], optional): _description_. Defaults to None.
             count (Optional[int], optional): _description_. Defaults to None.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
 
         Returns:
             Check: Check object or list of Checks
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/getChecks"
-
         if check_ids and type(check_ids) == list:
-            check_ids = ",".join(map(str, check_ids))
+            if (
+                len(check_ids) > self.MAX_IDS_PER_REQUEST
+                and offset is None
+                and count is None
+            ):
+                checks = await self.get_checks_by_ids(
+                    check_ids=check_ids,
+                    asset=asset,
+                    status=status,
+                    coalesce=coalesce,
+                )
+                return list(checks.values()) or None
+            if count is None:
+                count = len(check_ids)
 
         params = {
             "asset": asset,
@@ -461,18 +860,92 @@ class AioCryptoPay(BaseClient):
             "count": count,
         }
 
-        for key, value in params.copy().items():
-            if value is None:
-                del params[key]
+        page = await self._call(
+            "getChecks",
+            params=params,
+            result_type=models.Items[models.Check],
+            coalesce=coalesce,
+        )
+        if len(page.items) > 0:
+            if check_ids and isinstance(check_ids, int):
+                return page.items[0]
+            return page.items
+
+    async def get_checks_by_ids(
+        self,
+        check_ids: List[int],
+        asset: Optional[Union[Assets, str]] = None,
+        status: Optional[Union[CheckStatus, str]] = None,
+        chunk_size: int = MAX_IDS_PER_REQUEST,
+        concurrency: int = 4,
+        coalesce: bool = True,
+    ) -> Dict[int, Check]:
+        """
+        Get checks by any number of IDs.
+        IDs are split into chunks which are requested concurrently.
+
+        Args:
+            check_ids (List[int]): Check IDs.
+            asset (Optional[Union[Assets, str]], optional): Cryptocurrency alphabetic code. Defaults to all currencies.
+            status (Optional[Union[CheckStatus, str]], optional): Status of checks to be returned. Defaults to all statuses.
+            chunk_size (int, optional): IDs per request. Values between 1-1000 are accepted. Default is 1000.
+            concurrency (int, optional): Max number of requests in flight. Default is 4.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
 
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        Returns:
+            Dict[int, Check]: Found checks by ID in input order
+        """
+        return await self._get_by_ids(
+            fetch=lambda ids: self.get_checks(
+                check_ids=ids,
+                asset=asset,
+                status=status,
+                count=len(ids),
+                coalesce=coalesce,
+            ),
+            ids=check_ids,
+            key="check_id",
+            chunk_size=chunk_size,
+            concurrency=concurrency,
         )
 
-        if len(response["result"]["items"]) > 0:
-            if check_ids and isinstance(check_ids, int):
-                return Check(**response["result"]["items"][0])
-            return [Check(**check) for check in response["result"]["items"]]
+    async def iter_checks(
+        self,
+        asset: Optional[Union[Assets, str]] = None,
+        status: Optional[Union[CheckStatus, str]] = None,
+        offset: int = 0,
+        count: int = 1000,
+        prefetch: int = 2,
+        coalesce: bool = True,
+    ) -> AsyncIterator[Check]:
+        """
+        Iterate over all checks created by your app, page by page.
+        Next pages are requested while the current one is consumed.
+
+        Args:
+            asset (Optional[Union[Assets, str]], optional): Cryptocurrency alphabetic code. Defaults to all currencies.
+            status (Optional[Union[CheckStatus, str]], optional): Status of checks to be returned. Defaults to all statuses.
+            offset (int, optional): Offset of the first check. Default is 0.
+            count (int, optional): Page size. Values between 1-1000 are accepted. Default is 1000.
+            prefetch (int, optional): Number of pages requested ahead. Default is 2.
+            coalesce (bool, optional): Share the response with identical requests in flight. Default is True.
+
+        Yields:
+            Check: Check object
+        """
+
+        async def fetch_page(offset: int, count: int) -> List[Check]:
+            checks = await self.get_checks(
+                asset=asset,
+                status=status,
+                offset=offset,
+                count=count,
+                coalesce=coalesce,
+            )
+            return checks or []
+
+        async for check in paginate(fetch_page, offset, count, prefetch):
+            yield check
 
     async def delete_check(self, check_id: int) -> bool:
         """
@@ -485,32 +958,118 @@ class AioCryptoPay(BaseClient):
         Returns:
             bool: Returns True on success.
         """
-        method = HTTPMethods.GET
-        url = f"{self.network}/api/deleteCheck"
-
         params = {"check_id": check_id}
 
-        response = await self._make_request(
-            method=method, url=url, params=params, headers=self.__headers
+        return await self._call(
+            "deleteCheck",
+            params=params,
+            result_type=bool,
         )
-        return response["result"]
 
-    def check_signature(self, body_text: str, crypto_pay_signature: str) -> bool:
+    async def delete_checks(
+        self, check_ids: Iterable[int], concurrency: int = 10
+    ) -> AsyncIterator[BatchResult[bool]]:
+        """
+        Delete many checks concurrently.
+        Results are yielded as soon as each check is deleted, a failed item does not stop the batch.
+
+        Args:
+            check_ids (Iterable[int]): Check IDs to be deleted.
+            concurrency (int, optional): Max number of requests in flight. Default is 10.
+
+        Yields:
+            BatchResult[bool]: Deletion result or error with the index of its check ID
+        """
+        async for result in run_batch(
+            lambda check_id: self.delete_check(check_id=check_id),
+            check_ids,
+            concurrency,
+        ):
+            yield result
+
+    def _cache_invoices(self, invoices: Iterable[Invoice]) -> None:
+        if self._invoice_cache is None:
+            return
+        for invoice in invoices:
+            # A response started before the paid webhook may arrive after it,
+            # an active invoice never replaces a paid or expired one.
+            if invoice.status == InvoiceStatus.ACTIVE:
+                cached = self._invoice_cache.get(invoice.invoice_id)
+                if cached is not None and cached.status != InvoiceStatus.ACTIVE:
+                    continue
+            self._invoice_cache.set(invoice.invoice_id, invoice)
+
+    async def _get_cached_invoices(
+        self,
+        invoice_ids: Union[List[int], int],
+        max_age: Optional[float],
+        coalesce: bool = True,
+    ) -> Optional[Union[Invoice, List[Invoice]]]:
+        """Read invoices through the cache, requesting only missing and too old ones."""
+        if isinstance(invoice_ids, int):
+            ids = [invoice_ids]
+        elif isinstance(invoice_ids, str):
+            ids = [int(invoice_id) for invoice_id in invoice_ids.split(",")]
+        else:
+            ids = [int(invoice_id) for invoice_id in invoice_ids]
+        found: Dict[int, Invoice] = {}
+        missing: List[int] = []
+        for invoice_id in ids:
+            entry = self._invoice_cache.get_with_age(invoice_id)
+            if entry is not None and (max_age is None or entry[1] <= max_age):
+                found[invoice_id] = entry[0]
+            else:
+                missing.append(invoice_id)
+
+        if missing:
+            found.update(
+                await self.get_invoices_by_ids(invoice_ids=missing, coalesce=coalesce)
+            )
+
+        invoices = [found[invoice_id] for invoice_id in ids if invoice_id in found]
+        if isinstance(invoice_ids, int):
+            return invoices[0] if invoices else None
+        return invoices or None
+
+    @staticmethod
+    async def _get_by_ids(
+        fetch: Callable[[List[int]], Awaitable[Optional[List[T]]]],
+        ids: List[int],
+        key: str,
+        chunk_size: int,
+        concurrency: int,
+    ) -> Dict[int, T]:
+        """Fetch items by IDs in concurrent chunks and index them by `key` in input order."""
+        ids = list(dict.fromkeys(map(int, ids)))
+        chunk_size = min(chunk_size, AioCryptoPay.MAX_IDS_PER_REQUEST)
+        pages = await gather_limited(
+            (lambda chunk=chunk: fetch(chunk) for chunk in chunked(ids, chunk_size)),
+            limit=concurrency,
+        )
+        found = {getattr(item, key): item for page in pages for item in page or []}
+        return {item_id: found[item_id] for item_id in ids if item_id in found}
+
+    def check_signature(
+        self, body_text: Union[str, bytes], crypto_pay_signature: str
+    ) -> bool:
         """
         https://help.crypt.bot/crypto-pay-api#verifying-webhook-updates
 
         Args:
-            body_text (str): webhook update body
+            body_text (Union[str, bytes]): webhook update body, raw bytes are preferred
             crypto_pay_signature (str): Crypto-Pay-Api-Signature header
 
         Returns:
             bool: is cryptopay api signature
         """
-        token = sha256(string=self.__token.encode("UTF-8")).digest()
-        signature = HMAC(
-            key=token, msg=body_text.encode("UTF-8"), digestmod=sha256
-        ).hexdigest()
-        return signature == crypto_pay_signature
+        if isinstance(body_text, str):
+            body_text = body_text.encode("UTF-8")
+        signature = self.__signature_hmac.copy()
+        signature.update(body_text)
+        return compare_digest(
+            signature.hexdigest().encode("UTF-8"),
+            crypto_pay_signature.encode("UTF-8"),
+        )
 
     async def get_updates(self, request: Request) -> Response:
         """
@@ -520,25 +1079,53 @@ class AioCryptoPay(BaseClient):
             request (Request): WebHook request
 
         Returns:
-            Response: 200 status code for cryptopay api
+            Response: 200 status code for cryptopay api, 401 for invalid signature
         """
-        body = await request.json()
-        body_text = await request.text()
-        crypto_pay_signature = request.headers.get(
-            "Crypto-Pay-Api-Signature", "No value"
-        )
-        signature = self.check_signature(
-            body_text=body_text, crypto_pay_signature=crypto_pay_signature
-        )
-        if signature:
-            for handler in self._handlers:
-                await handler(Update(**body), request.app)
+        from aiohttp.web import Response
+
+        body = await request.read()
+        crypto_pay_signature = request.headers.get("Crypto-Pay-Api-Signature", "")
+        if not self.check_signature(
+            body_text=body, crypto_pay_signature=crypto_pay_signature
+        ):
+            return Response(status=401, text="Invalid signature")
+
+        update = models.Update.model_validate_json(body)
+        self._cache_invoices([update.payload])
+        dedup = self._dedup_storage
+        if dedup is not None and await dedup.is_duplicate(update.update_id):
             return Response(text="Status OK!")
 
+        try:
+            await self._process_update(update, request.app)
+        except BaseException:
+            # Crypto Pay retries the update, it must not be taken for a duplicate
+            if dedup is not None:
+                await dedup.discard(update.update_id)
+            raise
+        return Response(text="Status OK!")
+
+    @property
+    def dedup_stats(self) -> Dict[str, int]:
+        """Webhook dedup hits (skipped retries) and misses (new updates)"""
+        if self._dedup_storage is None:
+            return {"hits": 0, "misses": 0}
+        return self._dedup_storage.stats
+
+    async def _process_update(self, update: Update, app: Any = None) -> None:
+        """Pass update to the pay handlers or to the dispatch queue."""
+        if self._dispatcher is not None:
+            await self._dispatcher.put(update, app)
+            return
+
+        for handler in self._handlers:
+            await handler(update, app)
+
     async def get_amount_by_fiat(
         self, summ: Union[int, float], asset: Union[Assets, str], target: str
     ) -> Union[int, float]:
-        """Get amount in crypto by fiat summ
+        """Get amount in crypto by fiat summ.
+        Exchange rates are taken from the client rates cache, see `rates_ttl`.
 
         Args:
             summ (Union[int, float]): Summ in fiat.
@@ -548,11 +1135,19 @@ class AioCryptoPay(BaseClient):
         Returns:
             Union[int, float]: Amount in crypto
         """
-        rates = await self.get_exchange_rates()
-        rate = get_rate(source=asset, target=target, rates=rates)
+        rate = await self._rates_cache.get_rate(source=asset, target=target)
         fiat_summ = get_rate_summ(summ=summ, rate=rate)
         return fiat_summ
 
+    async def get_rate_matrix(self) -> RateMatrix:
+        """Get cross rates of all currencies from the client rates cache.
+        Pairs without a direct rate are crossed through USD and USDT.
+
+        Returns:
+            RateMatrix: Rates between every pair of currencies, use `convert` for price lists
+        """
+        return await self._rates_cache.get_matrix()
+
     def register_pay_handler(self, func: Callable) -> None:
         """
         Register handler when invoice paid.
@@ -569,6 +1164,130 @@ class AioCryptoPay(BaseClient):
 
         return decorator
 
+    def save_snapshot(self, path: PathLike) -> None:
+        """
+        Save client state to a file to warm start other processes or the next run.
+        The snapshot holds the last profile, currencies and exchange rates with fetch times
+        and recent webhook update IDs. The file is replaced atomically.
+
+        Args:
+            path (PathLike): Snapshot file
+        """
+        now = time.time()
+        state: Dict[str, Any] = {"saved_at": now}
+        if self.profile is not None:
+            state["profile"] = {
+                "data": self._dump_model(self.profile),
+                "fetched_at": self._profile_fetched_at,
+            }
+        if self.currencies is not None:
+            state["currencies"] = {
+                "data": [self._dump_model(currency) for currency in self.currencies],
+                "fetched_at": self._currencies_fetched_at,
+            }
+        rates_age = self._rates_cache.age
+        if rates_age is not None:
+            state["rates"] = {
+                "data": [self._dump_model(rate) for rate in self._rates_cache.rates],
+                "fetched_at": now - rates_age,
+            }
+        if isinstance(self._dedup_storage, MemoryDedupStorage):
+            state["update_ids"] = self._dedup_storage.update_ids()
+        write_snapshot(path, state)
+
+    async def load_snapshot(self, path: PathLike, max_age: float = 3600) -> bool:
+        """
+        Restore client state saved by save_snapshot.
+        Profile and currencies older than max_age are skipped, exchange rates are restored
+        only if they are within rates_max_staleness and keep their real age.
+
+        Args:
+            path (PathLike): Snapshot file
+            max_age (float, optional): Max age in seconds of restored profile and currencies. Default is 3600.
+
+        Returns:
+            bool: False if there is no usable snapshot
+        """
+        state = read_snapshot(path)
+        if state is None:
+            return False
+
+        now = time.time()
+
+        def fresh(section: str, limit: float) -> Optional[Dict[str, Any]]:
+            entry = state.get(section)
+            if entry and entry.get("fetched_at") and now - entry["fetched_at"] <= limit:
+                return entry
+            return None
+
+        profile = fresh("profile", max_age)
+        if profile is not None:
+            self.profile = models.Profile.model_validate(profile["data"])
+            self._profile_fetched_at = profile["fetched_at"]
+
+        currencies = fresh("currencies", max_age)
+        if currencies is not None:
+            self.currencies = [
+                models.Currency.model_validate(currency)
+                for currency in currencies["data"]
+            ]
+            self._currencies_fetched_at = currencies["fetched_at"]
+
+        rates = fresh("rates", self._rates_cache.max_staleness)
+        if rates is not None and self._rates_cache.age is None:
+            self._rates_cache.set(
+                [models.ExchangeRate.model_validate(rate) for rate in rates["data"]],
+                age=now - rates["fetched_at"],
+            )
+
+        if self._dedup_storage is not None:
+            for update_id in state.get("update_ids", []):
+                await self._dedup_storage.add(update_id)
+        return True
+
+    @staticmethod
+    def _dump_model(model: Any) -> Dict[str, Any]:
+        if isinstance(model, models.LazyRecord):
+            model = model.to_model()
+        return model.model_dump(mode="json")
+
+    async def warmup(self, connections: int = 1) -> None:
+        """
+        Open pooled connections ahead of traffic.
+        Sends `connections` concurrent getMe requests, so the TLS handshakes are done before the first real call.
+
+        Args:
+            connections (int, optional): Number of connections to open. Default is 1.
+        """
+        await asyncio.gather(
+            *(self._call("getMe", coalesce=False) for _ in range(connections))
+        )
+
+    async def _call(
+        self,
+        name: str,
+        params: Optional[Dict[str, Any]] = None,
+        result_type: Optional[Any] = None,
+        coalesce: bool = True,
+    ) -> Any:
+        """Call API method by its spec in ENDPOINTS."""
+        endpoint = ENDPOINTS[name]
+        return await self._make_request(
+            method=endpoint.http_method,
+            url=self._urls[name],
+            headers=self.__headers,
+            result_type=result_type,
+            coalesce=coalesce,
+            **endpoint.request_kwargs(params),
+        )
+
+    async def close(self) -> None:
+        """Stop background work and close the session graceful."""
+        if self._dispatcher is not None:
+            await self._dispatcher.close(timeout=self._dispatch_drain_timeout)
+        await self._rates_cache.close()
+        await super().close()
+
     async def __aenter__(self) -> None:
         return self
 
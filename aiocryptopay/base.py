@@ -1,51 +1,495 @@
 import asyncio
+import random
 import ssl
-from typing import Optional
+from functools import lru_cache
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Optional,
+    Type,
+)
 
-import certifi
-from aiohttp import ClientSession, TCPConnector
+from aiohttp import (
+    ClientConnectionError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
 from aiohttp.typedefs import StrOrURL
+from yarl import URL
 
 from .exceptions import CryptoPayAPIError
+from .exceptions.factory import CodeErrorFactory
+from .utils.circuit_breaker import CircuitBreaker
+from .utils.decoding import decode_response, json_loads as default_json_loads
+from .utils.latency import LatencyWindow
+from .utils.rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    from .models.response import APIResponse
+    from .utils.metrics import BaseMetrics
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context() -> ssl.SSLContext:
+    """SSL context with certifi CA bundle. Created once per process."""
+    import certifi
+
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def create_connector(
+    limit: int = 100,
+    limit_per_host: int = 0,
+    keepalive_timeout: float = 15,
+    ttl_dns_cache: Optional[int] = 10,
+) -> TCPConnector:
+    """
+    Create a connector with the shared SSL context.
+        Pass it to several clients to share one connection pool between them.
+        Call it inside a coroutine: aiohttp requires a running event loop here,
+        so a connector can't be created at module level.
+
+        :param limit: total number of simultaneous connections, 0 for unlimited
+        :param limit_per_host: simultaneous connections to one host, 0 for unlimited
+        :param keepalive_timeout: seconds an idle connection is kept in the pool
+        :param ttl_dns_cache: seconds DNS lookups are cached, None to cache forever
+    """
+    return TCPConnector(
+        ssl=get_ssl_context(),
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+    )
 
 
 class BaseClient:
     """Base aiohttp client"""
 
-    def __init__(self) -> None:
+    # Endpoints which are safe to repeat. Other endpoints are retried only
+    # when the request carries a `spend_id`.
+    IDEMPOTENT_ENDPOINTS: FrozenSet[str] = frozenset()
+    # Read-only endpoints. Identical concurrent requests to them share one response.
+    READ_ENDPOINTS: FrozenSet[str] = frozenset()
+
+    def __init__(
+        self,
+        rate_limit: Optional[float] = None,
+        rate_limit_burst: Optional[float] = None,
+        endpoint_rate_limits: Optional[Dict[str, float]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 10,
+        connector: Optional[TCPConnector] = None,
+        connector_limit: int = 100,
+        connector_limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        ttl_dns_cache: Optional[int] = 10,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+        trusted: bool = False,
+        metrics: Optional["BaseMetrics"] = None,
+        timeout: Optional[float] = None,
+        endpoint_timeouts: Optional[Dict[str, float]] = None,
+        circuit_breaker_threshold: Optional[int] = None,
+        circuit_breaker_timeout: float = 30,
+        hedge_quantile: Optional[float] = None,
+    ) -> None:
         """
         Set defaults on object init.
             By default `self._session` is None.
             It will be created on a first API request.
             The second request will use the same `self._session`.
+
+            :param rate_limit: max requests per second for the whole client, unlimited by default
+            :param rate_limit_burst: max requests sent at once before `rate_limit` applies
+            :param endpoint_rate_limits: max requests per second by endpoint name, e.g. {"createInvoice": 5}
+            :param max_retries: retries of idempotent requests on rate limit and transient errors
+            :param retry_backoff: base delay of the exponential backoff in seconds
+            :param retry_backoff_max: max delay between retries in seconds
+            :param connector: shared connector, see `create_connector`. It is not closed with the client.
+                It must be created inside a coroutine, so clients sharing it are created there too.
+                Otherwise the client creates its own connector from the settings below.
+            :param connector_limit: total number of simultaneous connections, 0 for unlimited
+            :param connector_limit_per_host: simultaneous connections to one host, 0 for unlimited
+            :param keepalive_timeout: seconds an idle connection is kept in the pool
+            :param ttl_dns_cache: seconds DNS lookups are cached, None to cache forever
+            :param json_loads: JSON backend. By default typed results are parsed by pydantic
+                straight from bytes, and untyped ones by orjson when it is installed.
+            :param trusted: skip validation of typed results. Models are replaced with lazy
+                records converting each field on its first access, see `models.lazy.LazyRecord`.
+            :param metrics: instrumentation hooks, e.g. `utils.metrics.Metrics`. Disabled by default.
+            :param timeout: total seconds per request attempt, aiohttp default (5 minutes) if not set
+            :param endpoint_timeouts: total seconds per request attempt by endpoint name, e.g. {"getInvoices": 10}
+            :param circuit_breaker_threshold: consecutive 5xx, connection errors or timeouts after which
+                requests fail fast with `CircuitOpenError`. Disabled by default.
+            :param circuit_breaker_timeout: seconds the circuit stays open before a probe request
+            :param hedge_quantile: quantile of recent latency, e.g. 0.95. A read request slower
+                than it is sent once more and the first response wins. Disabled by default.
         """
         self._loop = asyncio.get_event_loop()
         self._session: Optional[ClientSession] = None
 
+        self._rate_limiter = (
+            TokenBucket(rate_limit, rate_limit_burst) if rate_limit else None
+        )
+        self._endpoint_rate_limiters = {
+            endpoint: TokenBucket(rate)
+            for endpoint, rate in (endpoint_rate_limits or {}).items()
+        }
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+
+        self._connector = connector
+        self._connector_settings = {
+            "limit": connector_limit,
+            "limit_per_host": connector_limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+
+        self._json_loads = json_loads
+        self._trusted = trusted
+        self.metrics = metrics
+
+        self._timeout = ClientTimeout(total=timeout) if timeout else None
+        self._endpoint_timeouts = {
+            endpoint: ClientTimeout(total=seconds)
+            for endpoint, seconds in (endpoint_timeouts or {}).items()
+        }
+        self._circuit_breaker = (
+            CircuitBreaker(circuit_breaker_threshold, circuit_breaker_timeout)
+            if circuit_breaker_threshold
+            else None
+        )
+        self.hedge_quantile = hedge_quantile
+        self._latency = LatencyWindow() if hedge_quantile else None
+
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
     def get_session(self, **kwargs):
         """Get cached session. One session per instance."""
         if isinstance(self._session, ClientSession) and not self._session.closed:
             return self._session
 
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        connector = TCPConnector(ssl=ssl_context)
+        if self.metrics is not None:
+            kwargs.setdefault("trace_configs", [self.metrics.trace_config()])
 
-        self._session = ClientSession(connector=connector, **kwargs)
+        if self._connector is not None:
+            self._session = ClientSession(
+                connector=self._connector, connector_owner=False, **kwargs
+            )
+        else:
+            connector = create_connector(**self._connector_settings)
+            self._session = ClientSession(connector=connector, **kwargs)
         return self._session
 
-    async def _make_request(self, method: str, url: StrOrURL, **kwargs) -> dict:
+    async def _make_request(
+        self,
+        method: str,
+        url: StrOrURL,
+        result_type: Optional[Type] = None,
+        coalesce: bool = True,
+        **kwargs,
+    ) -> Any:
         """
         Make a request.
+            Identical concurrent requests to read-only endpoints are coalesced:
+            they wait for one shared response. Waits for the rate limiters first.
+            Idempotent requests are retried with jittered exponential backoff
+            on rate limit, 5xx and connection errors.
+
             :param method: HTTP Method
             :param url: endpoint link
+            :param result_type: type of the result, e.g. List[Invoice].
+                The body is decoded into it in one pass and the result is returned.
+                Without it the whole response is returned as dict.
+            :param coalesce: share the response with identical requests in flight
             :param kwargs: data, params, json and other...
             :return: status and result or exception
         """
+        endpoint = URL(url).name
+        params = kwargs.get("params") or {}
+        if not coalesce or endpoint not in self.READ_ENDPOINTS:
+            return await self._request_with_retries(
+                method, url, endpoint, result_type, **kwargs
+            )
+
+        key = (method, str(url), tuple(sorted(params.items())), result_type)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._request_with_retries(method, url, endpoint, result_type, **kwargs)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Retrieve the error even if every caller was cancelled.
+            future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return self._copy_shared(await asyncio.shield(future))
+
+    def _copy_shared(self, result: Any) -> Any:
+        """Shallow copy of a coalesced result, so callers don't see each other's changes to its list."""
+        if isinstance(result, list):
+            return list(result)
+        if self._trusted:
+            from .models.lazy import LazyRecord
+
+            if isinstance(result, LazyRecord):
+                # A new record of the same raw data converts its fields again
+                return type(result)(result._raw)
+        items = getattr(result, "items", None)
+        if isinstance(items, list):
+            return result.model_copy(update={"items": list(items)})
+        return result
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: str,
+        result_type: Optional[Type] = None,
+        **kwargs,
+    ) -> Any:
+        """Send a request, retrying idempotent ones on transient errors."""
+        params = kwargs.get("params") or kwargs.get("json") or {}
+        retryable = endpoint in self.IDEMPOTENT_ENDPOINTS or "spend_id" in params
+        timeout = self._endpoint_timeouts.get(endpoint, self._timeout)
+        if timeout is not None:
+            kwargs.setdefault("timeout", timeout)
+
+        attempt = 0
+        while True:
+            await self._acquire_rate_limit(endpoint)
+            try:
+                return await self._send_attempt(
+                    method, url, endpoint, result_type, **kwargs
+                )
+            except (
+                CodeErrorFactory,
+                ClientConnectionError,
+                asyncio.TimeoutError,
+            ) as error:
+                if (
+                    not retryable
+                    or attempt >= self.max_retries
+                    or not self._is_transient_error(error)
+                ):
+                    raise
+                delay = self._get_retry_delay(attempt, error)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_attempt(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: str,
+        result_type: Optional[Type] = None,
+        **kwargs,
+    ) -> Any:
+        """Send a request through the circuit breaker, hedging idempotent reads."""
+        breaker = self._circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+
+        try:
+            if (
+                self._latency is not None
+                and endpoint in self.READ_ENDPOINTS
+                and endpoint in self.IDEMPOTENT_ENDPOINTS
+            ):
+                result = await self._send_hedged(
+                    method, url, endpoint, result_type, **kwargs
+                )
+            else:
+                result = await self._send_request(method, url, result_type, **kwargs)
+        except Exception as error:
+            if breaker is not None:
+                if self._is_server_failure(error):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: str,
+        result_type: Optional[Type] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Send a read request, and once more if it is slower than `hedge_quantile`
+            of recent requests to the endpoint. The first response wins.
+        """
+        delay = self._latency.quantile(endpoint, self.hedge_quantile)
+        started = perf_counter()
+        tasks = {
+            asyncio.ensure_future(
+                self._send_request(method, url, result_type, **kwargs)
+            )
+        }
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    await self._acquire_rate_limit(endpoint)
+                    tasks.add(
+                        asyncio.ensure_future(
+                            self._send_request(method, url, result_type, **kwargs)
+                        )
+                    )
+
+            while True:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self._latency.observe(endpoint, perf_counter() - started)
+                        return task.result()
+                if not tasks:
+                    # Every attempt failed
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _send_request(
+        self,
+        method: str,
+        url: StrOrURL,
+        result_type: Optional[Type] = None,
+        **kwargs,
+    ) -> Any:
+        """Send a request once and validate the response."""
+        metrics = self.metrics
+        if metrics is None:
+            return await self._send_request_once(method, url, result_type, **kwargs)
+
+        endpoint = URL(url).name
+        metrics.on_request_start(endpoint)
+        started = perf_counter()
+        error = None
+        try:
+            return await self._send_request_once(
+                method, url, result_type, endpoint, **kwargs
+            )
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            metrics.on_request_end(endpoint, perf_counter() - started, error)
+
+    async def _send_request_once(
+        self,
+        method: str,
+        url: StrOrURL,
+        result_type: Optional[Type] = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> Any:
+        """Send a request and validate the response, timing its phases when `endpoint` is set."""
         session = self.get_session()
+        metrics = self.metrics if endpoint is not None else None
 
         async with session.request(method, url, **kwargs) as response:
-            response = await response.json(content_type="application/json")
-        return self._validate_response(response)
+            if metrics is not None:
+                started = perf_counter()
+            body = await response.read()
+            status, reason = response.status, response.reason
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+        if metrics is not None:
+            metrics.on_phase(endpoint, "read", perf_counter() - started)
+            started = perf_counter()
+
+        try:
+            try:
+                if result_type is None or self._trusted:
+                    data = (self._json_loads or default_json_loads)(body)
+                    phase = "decode"
+                else:
+                    data = decode_response(body, result_type, self._json_loads)
+                    phase = "build"
+            except ValueError:
+                if status < 400:
+                    raise
+                raise CryptoPayAPIError(status, reason or str(status))
+            if metrics is not None:
+                metrics.on_phase(endpoint, phase, perf_counter() - started)
+
+            if result_type is None:
+                return self._validate_response(data)
+            if self._trusted:
+                from .models.lazy import construct_lazy
+
+                result = self._validate_response(data)["result"]
+                if metrics is None:
+                    return construct_lazy(result_type, result)
+                started = perf_counter()
+                result = construct_lazy(result_type, result)
+                metrics.on_phase(endpoint, "build", perf_counter() - started)
+                return result
+            return self._validate_envelope(data)
+        except CodeErrorFactory as error:
+            error.retry_after = retry_after
+            raise
+
+    async def _acquire_rate_limit(self, endpoint: str) -> None:
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        endpoint_rate_limiter = self._endpoint_rate_limiters.get(endpoint)
+        if endpoint_rate_limiter is not None:
+            await endpoint_rate_limiter.acquire()
+
+    @staticmethod
+    def _is_server_failure(error: Exception) -> bool:
+        """5xx, connection errors and timeouts count towards the circuit breaker."""
+        if isinstance(error, CodeErrorFactory):
+            return error.code is not None and error.code >= 500
+        return isinstance(error, (ClientConnectionError, asyncio.TimeoutError))
+
+    @staticmethod
+    def _is_transient_error(error: Exception) -> bool:
+        """Rate limit, server side and connection errors are worth a retry."""
+        if isinstance(error, CodeErrorFactory):
+            return error.code is not None and (error.code == 429 or error.code >= 500)
+        return True
+
+    def _get_retry_delay(self, attempt: int, error: Exception) -> float:
+        """Full jitter exponential backoff, but not less than Retry-After."""
+        delay = random.uniform(
+            0, min(self.retry_backoff_max, self.retry_backoff * 2**attempt)
+        )
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_backoff_max))
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
 
     @staticmethod
     def _validate_response(response: dict) -> dict:
@@ -56,6 +500,13 @@ class BaseClient:
             raise CryptoPayAPIError(code, name)
         return response
 
+    @staticmethod
+    def _validate_envelope(response: "APIResponse") -> Any:
+        """Validate typed response and return its result"""
+        if not response.ok:
+            raise CryptoPayAPIError(response.error.code, response.error.name)
+        return response.result
+
     async def close(self):
         """Close the session graceful."""
         if not isinstance(self._session, ClientSession):
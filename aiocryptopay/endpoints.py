@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Mapping
+
+from .const import HTTPMethods
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    API method spec
+        :param name: API method name, the last part of the URL
+        :param http_method: HTTP method
+        :param read: read-only method, identical concurrent calls share one response
+        :param idempotent: safe to repeat, retried on transient errors
+        :param json_body: params are sent as a JSON body instead of the query string
+    """
+
+    name: str
+    http_method: str = HTTPMethods.GET
+    read: bool = False
+    idempotent: bool = False
+    json_body: bool = False
+
+    def serialize(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Prepare params in one pass: drop None, send datetimes as str,
+        join lists by comma and lowercase bools in the query string.
+        """
+        result = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                if not self.json_body:
+                    value = "true" if value else "false"
+            elif isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, datetime):
+                value = str(value)
+            elif isinstance(value, (list, tuple)):
+                value = ",".join(map(str, value))
+            result[key] = value
+        return result
+
+    def request_kwargs(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """aiohttp request arguments carrying serialized params"""
+        if not params:
+            return {}
+        return {"json" if self.json_body else "params": self.serialize(params)}
+
+
+def _endpoints(*endpoints: Endpoint) -> Dict[str, Endpoint]:
+    return {endpoint.name: endpoint for endpoint in endpoints}
+
+
+# Methods creating objects take long texts (description, hidden_message,
+# payload up to 4 KB), so they are sent as POST JSON bodies.
+ENDPOINTS = _endpoints(
+    Endpoint("getMe", read=True, idempotent=True),
+    Endpoint("getStats", read=True, idempotent=True),
+    Endpoint("getBalance", read=True, idempotent=True),
+    Endpoint("getExchangeRates", read=True, idempotent=True),
+    Endpoint("getCurrencies", read=True, idempotent=True),
+    Endpoint("createInvoice", HTTPMethods.POST, json_body=True),
+    Endpoint("getInvoices", read=True, idempotent=True),
+    Endpoint("deleteInvoice", idempotent=True),
+    Endpoint("transfer", HTTPMethods.POST, json_body=True),
+    Endpoint("getTransfers", read=True, idempotent=True),
+    Endpoint("createCheck", HTTPMethods.POST, json_body=True),
+    Endpoint("getChecks", read=True, idempotent=True),
+    Endpoint("deleteCheck", idempotent=True),
+)
@@ -1,3 +1,4 @@
+from .circuit import CircuitOpenError
 from .factory import CodeErrorFactory
 
 
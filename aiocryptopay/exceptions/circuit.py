@@ -0,0 +1,9 @@
+class CircuitOpenError(Exception):
+    """Request rejected without sending, the API failed too many times in a row"""
+
+    def __init__(self, retry_after: float = 0) -> None:
+        self.retry_after = retry_after
+        super().__init__(retry_after)
+
+    def __str__(self):
+        return f"Circuit breaker is open, retry after {self.retry_after:.1f}s\n"
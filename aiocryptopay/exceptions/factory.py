@@ -1,10 +1,17 @@
-import gc
-from typing import Optional, Type, Union
+import threading
+from typing import Dict, Optional, Tuple, Type, Union
 
 
 class CodeErrorFactory(Exception):
     """CryptoPay API Exception"""
 
+    # Exception classes by (factory class, code, name). Classes are created once,
+    # so raised errors are instances of the classes returned for catching.
+    _registry: Dict[
+        Tuple[type, Optional[int], Optional[str]], Type["CodeErrorFactory"]
+    ] = {}
+    _registry_lock = threading.Lock()
+
     def __init__(self, code: int = None, name: str = None) -> None:
         self.code = int(code) if code else None
         self.name = name
@@ -12,7 +19,7 @@ class CodeErrorFactory(Exception):
 
     @classmethod
     def __call__(
-        cls, code: Optional[int] = None, name: Optional[int] = None
+        cls, code: Optional[int] = None, name: Optional[str] = None
     ) -> Union["CodeErrorFactory", Type["CodeErrorFactory"]]:
         if name:
             return cls.exception_to_raise(code, str(name))
@@ -22,21 +29,20 @@ class CodeErrorFactory(Exception):
     def exception_to_handle(
         cls, code: Optional[int] = None
     ) -> Type["CodeErrorFactory"]:
+        """Returns the exception class of error code to catch"""
         if code is None:
             return cls
+        return cls._get_class(int(code), None)
 
-        catch_exc_classname = cls.generate_exc_classname(code)
-
-        for obj in gc.get_objects():
-            if obj.__class__.__name__ == catch_exc_classname:
-                return obj.__class__
-
-        return type(catch_exc_classname, (cls,), {})
+    @classmethod
+    def exception_for_name(cls, name: str) -> Type["CodeErrorFactory"]:
+        """Returns the exception class of error name to catch, e.g. "AMOUNT_TOO_SMALL" """
+        return cls._get_class(None, str(name))
 
     @classmethod
     def exception_to_raise(cls, code: int, name: str) -> "CodeErrorFactory":
         """Returns an error with error code and error_name"""
-        exception_type = type(cls.generate_exc_classname(code), (cls,), {})
+        exception_type = cls._get_class(int(code) if code else None, name)
         return exception_type(code, name)
 
     @classmethod
@@ -44,5 +50,39 @@ class CodeErrorFactory(Exception):
         """Generates unique exception classname based on error code"""
         return f"{cls.__name__}_{code}"
 
+    @classmethod
+    def _get_class(
+        cls, code: Optional[int], name: Optional[str]
+    ) -> Type["CodeErrorFactory"]:
+        """
+        Get or create the exception class of code and name.
+            The class of both inherits the code class and the name class,
+            so an error is caught by either of them.
+        """
+        key = (cls, code, name)
+        exception_type = cls._registry.get(key)
+        if exception_type is not None:
+            return exception_type
+
+        if code is not None and name is not None:
+            bases: Tuple[type, ...] = (
+                cls._get_class(code, None),
+                cls._get_class(None, name),
+            )
+            classname = f"{cls.generate_exc_classname(code)}_{name}"
+        elif code is not None:
+            bases = (cls,)
+            classname = cls.generate_exc_classname(code)
+        else:
+            bases = (cls,)
+            classname = f"{cls.__name__}_{name}"
+
+        with cls._registry_lock:
+            exception_type = cls._registry.get(key)
+            if exception_type is None:
+                exception_type = type(classname, bases, {"__module__": cls.__module__})
+                cls._registry[key] = exception_type
+        return exception_type
+
     def __str__(self):
         return f"[{self.code}] {self.name}\n"
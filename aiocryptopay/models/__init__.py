@@ -0,0 +1,48 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .app_stats import AppStats
+    from .balance import Balance
+    from .check import Check
+    from .currencies import Currency
+    from .invoice import Invoice
+    from .lazy import LazyRecord
+    from .profile import Profile
+    from .rates import ExchangeRate
+    from .response import APIError, APIResponse, Items
+    from .transfer import Transfer
+    from .update import Update
+
+
+# Models are imported on first access, pydantic is not loaded until then.
+_LAZY_IMPORTS = {
+    "AppStats": ".app_stats",
+    "Balance": ".balance",
+    "Check": ".check",
+    "Currency": ".currencies",
+    "Invoice": ".invoice",
+    "LazyRecord": ".lazy",
+    "Profile": ".profile",
+    "ExchangeRate": ".rates",
+    "APIError": ".response",
+    "APIResponse": ".response",
+    "Items": ".response",
+    "Transfer": ".transfer",
+    "Update": ".update",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,133 @@
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, TypeAdapter
+
+
+_MISSING = object()
+
+
+class LazyRecord:
+    """
+    Read-only stand-in of a pydantic model built from trusted data.
+        Raw values are kept as is and every field is converted
+        (datetime, enum, nested models) only on its first access.
+        Use `to_model` to get a fully validated model.
+    """
+
+    __slots__ = ("_raw", "_values")
+    __model__: Type[BaseModel] = BaseModel
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self._raw = raw
+        self._values: Optional[Dict[str, Any]] = None
+
+    def to_model(self) -> BaseModel:
+        """Validate raw data into the real model"""
+        return self.__model__.model_validate(self._raw)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._raw!r})"
+
+
+class _LazyField:
+    __slots__ = ("name", "convert", "default")
+
+    def __init__(
+        self, name: str, convert: Callable[[Any], Any], default: Callable[[], Any]
+    ) -> None:
+        self.name = name
+        self.convert = convert
+        self.default = default
+
+    def __get__(self, record: Optional[LazyRecord], owner: type) -> Any:
+        if record is None:
+            return self
+        values = record._values
+        if values is None:
+            values = record._values = {}
+        elif self.name in values:
+            return values[self.name]
+
+        raw = record._raw.get(self.name, _MISSING)
+        value = self.default() if raw is _MISSING else self.convert(raw)
+        values[self.name] = value
+        return value
+
+
+def _model_type(annotation: Any) -> Optional[Type[BaseModel]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _get_converter(annotation: Any) -> Callable[[Any], Any]:
+    """Nested models and lists of models stay lazy, other values are validated."""
+    args = get_args(annotation)
+    if get_origin(annotation) is Union and type(None) in args:
+        inner = [arg for arg in args if arg is not type(None)]
+        if len(inner) == 1:
+            convert = _get_converter(inner[0])
+            return lambda raw: None if raw is None else convert(raw)
+
+    model = _model_type(annotation)
+    if model is not None:
+        return lazy_model(model)
+
+    if get_origin(annotation) in (list, List) and args and _model_type(args[0]):
+        record_class = lazy_model(args[0])
+        return lambda raw: [record_class(item) for item in raw]
+
+    validate = TypeAdapter(annotation).validate_python
+    if annotation in (str, int, bool):
+        # JSON already gives these types, validate only unexpected values
+        return lambda raw: raw if type(raw) is annotation else validate(raw)
+    return validate
+
+
+@lru_cache(maxsize=None)
+def lazy_model(model: Type[BaseModel]) -> Type[LazyRecord]:
+    """Get lazy record class for a pydantic model"""
+    attributes: Dict[str, Any] = {"__slots__": (), "__model__": model}
+    for name, field in model.model_fields.items():
+        attributes[name] = _LazyField(
+            name=name,
+            convert=_get_converter(field.annotation),
+            default=lambda field=field: field.get_default(call_default_factory=True),
+        )
+    return type(f"Lazy{model.__name__}", (LazyRecord,), attributes)
+
+
+def construct_lazy(result_type: Any, raw: Any) -> Any:
+    """Build lazy records of `result_type` from raw data without validation
+
+    Args:
+        result_type (Any): Model or list of models, other types are returned as is
+        raw (Any): Decoded JSON
+
+    Returns:
+        Any: Lazy record, list of lazy records or raw value
+    """
+    if raw is None:
+        return None
+
+    model = _model_type(result_type)
+    if model is not None:
+        return lazy_model(model)(raw)
+
+    args = get_args(result_type)
+    if get_origin(result_type) in (list, List) and args and _model_type(args[0]):
+        record_class = lazy_model(args[0])
+        return [record_class(item) for item in raw]
+
+    return raw
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+from typing import Generic, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class APIError(BaseModel):
+    code: int
+    name: str
+
+
+class APIResponse(BaseModel, Generic[T]):
+    ok: bool
+    result: Optional[T] = None
+    error: Optional[APIError] = None
+
+
+class Items(BaseModel, Generic[T]):
+    items: List[T]
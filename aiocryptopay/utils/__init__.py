@@ -1 +1,73 @@
-from .exchange import get_rate, get_rate_summ
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .exchange import RateMatrix, get_rate, get_rate_summ, index_rates
+    from .rates_cache import ExchangeRatesCache
+    from .pagination import paginate
+    from .concurrency import chunked, gather_limited
+    from .batch import BatchResult, run_batch
+    from .rate_limit import TokenBucket
+    from .decoding import decode_response, json_loads
+    from .dispatcher import UpdateDispatcher
+    from .cache import TTLCache
+    from .dedup import BaseDedupStorage, MemoryDedupStorage
+    from .watcher import InvoiceWatcher
+    from .snapshot import read_snapshot, write_snapshot
+    from .metrics import BaseMetrics, Metrics
+    from .payouts import PayoutBatch, PayoutJournal, PayoutReport, PayoutResult
+    from .circuit_breaker import CircuitBreaker
+    from .latency import LatencyWindow
+    from .stats import StatsAggregator
+    from .export import Exporter
+
+
+# Utilities are imported on first access, so e.g. sqlite3 and csv
+# are not loaded with the client.
+_LAZY_IMPORTS = {
+    "RateMatrix": ".exchange",
+    "get_rate": ".exchange",
+    "get_rate_summ": ".exchange",
+    "index_rates": ".exchange",
+    "ExchangeRatesCache": ".rates_cache",
+    "paginate": ".pagination",
+    "chunked": ".concurrency",
+    "gather_limited": ".concurrency",
+    "BatchResult": ".batch",
+    "run_batch": ".batch",
+    "TokenBucket": ".rate_limit",
+    "decode_response": ".decoding",
+    "json_loads": ".decoding",
+    "UpdateDispatcher": ".dispatcher",
+    "TTLCache": ".cache",
+    "BaseDedupStorage": ".dedup",
+    "MemoryDedupStorage": ".dedup",
+    "InvoiceWatcher": ".watcher",
+    "read_snapshot": ".snapshot",
+    "write_snapshot": ".snapshot",
+    "BaseMetrics": ".metrics",
+    "Metrics": ".metrics",
+    "PayoutBatch": ".payouts",
+    "PayoutJournal": ".payouts",
+    "PayoutReport": ".payouts",
+    "PayoutResult": ".payouts",
+    "CircuitBreaker": ".circuit_breaker",
+    "LatencyWindow": ".latency",
+    "StatsAggregator": ".stats",
+    "Exporter": ".export",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
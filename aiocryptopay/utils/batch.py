@@ -0,0 +1,83 @@
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class BatchResult(Generic[T]):
+    """Outcome of one batch item"""
+
+    index: int
+    request: Any
+    result: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_batch(
+    func: Callable[[Any], Awaitable[T]],
+    requests: Iterable[Any],
+    concurrency: int = 10,
+) -> AsyncIterator[BatchResult[T]]:
+    """Call `func` for every request, at most `concurrency` calls at a time
+
+    Requests are consumed lazily. Results are yielded as calls complete,
+    so they may come out of input order; use `BatchResult.index` to match
+    them. An exception raised by one call is stored in its result and
+    does not stop the batch.
+
+    Args:
+        func (Callable[[Any], Awaitable[T]]): Coroutine function called with each request
+        requests (Iterable[Any]): Requests
+        concurrency (int): Max number of calls in flight. Defaults to 10.
+
+    Yields:
+        BatchResult[T]: Per-item result or error
+    """
+
+    async def call(index: int, request: Any) -> BatchResult[T]:
+        try:
+            return BatchResult(index=index, request=request, result=await func(request))
+        except Exception as error:
+            return BatchResult(index=index, request=request, error=error)
+
+    iterator = enumerate(requests)
+    pending: Set[asyncio.Future] = set()
+
+    def fill() -> None:
+        while len(pending) < max(concurrency, 1):
+            try:
+                index, request = next(iterator)
+            except StopIteration:
+                return
+            pending.add(asyncio.ensure_future(call(index, request)))
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            fill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache with per-entry time to live"""
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = None) -> None:
+        """
+        Init cache
+            :param maxsize: max number of entries, the least recently used are evicted first
+            :param ttl: seconds an entry lives, None to keep entries until evicted by size
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get_with_age(key) is not None
+
+    def __iter__(self) -> Iterator[K]:
+        """Iterate over live keys from the least to the most recently used."""
+        now = time.monotonic()
+        return iter(
+            [
+                key
+                for key, (created_at, _) in self._data.items()
+                if self.ttl is None or now - created_at < self.ttl
+            ]
+        )
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self.get_with_age(key)
+        return entry[0] if entry is not None else default
+
+    def get_with_age(self, key: K) -> Optional[Tuple[V, float]]:
+        """Get value and its age in seconds, None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        age = time.monotonic() - created_at
+        if self.ttl is not None and age >= self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value, age
+
+    def set(self, key: K, value: V, age: float = 0) -> None:
+        """
+        Set value.
+            :param age: how many seconds ago the value was obtained
+        """
+        self._data[key] = (time.monotonic() - age, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else default
+
+    def clear(self) -> None:
+        self._data.clear()
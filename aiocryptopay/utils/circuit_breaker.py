@@ -0,0 +1,78 @@
+import time
+
+from ..exceptions.circuit import CircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker
+        Closed: requests pass, consecutive failures are counted.
+        Open: after `failure_threshold` failures requests fail fast
+        with CircuitOpenError for `recovery_timeout` seconds.
+        Half-open: then up to `half_open_max_calls` probe requests pass.
+        A successful probe closes the circuit, a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        """
+        Init circuit breaker
+            :param failure_threshold: consecutive failures opening the circuit
+            :param recovery_timeout: seconds the circuit stays open before probing
+            :param half_open_max_calls: probe requests allowed at once in half-open state
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be positive")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """Let a request pass or raise CircuitOpenError"""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return
+        retry_after = self._opened_at + self.recovery_timeout - time.monotonic()
+        raise CircuitOpenError(max(retry_after, 0))
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._state = self.CLOSED
+        self._probes = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probes = 0
+
+    def release(self) -> None:
+        """Free the probe slot of a request finished without an outcome, e.g. cancelled"""
+        if self._state == self.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    """Split items into chunks
+
+    Args:
+        items (Sequence[T]): Items to split
+        size (int): Max chunk size
+
+    Returns:
+        List[Sequence[T]]: Chunks in input order
+    """
+    if size < 1:
+        raise ValueError("size must be positive")
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def gather_limited(
+    funcs: Iterable[Callable[[], Awaitable[T]]], limit: int
+) -> List[T]:
+    """Run coroutine functions concurrently, at most `limit` at a time
+
+    Args:
+        funcs (Iterable[Callable[[], Awaitable[T]]]): Coroutine functions without arguments
+        limit (int): Max number of concurrently running coroutines
+
+    Returns:
+        List[T]: Results in input order
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def run(func: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await func()
+
+    return await asyncio.gather(*(run(func) for func in funcs))
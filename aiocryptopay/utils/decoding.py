@@ -0,0 +1,47 @@
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Optional, Type
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+    from ..models.response import APIResponse
+
+try:
+    import orjson
+
+    json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+@lru_cache(maxsize=None)
+def get_response_adapter(result_type: Type) -> "TypeAdapter":
+    """Cached adapter of the API response envelope with `result_type` result"""
+    # pydantic is imported on the first typed response to keep the package import cheap
+    from pydantic import TypeAdapter
+
+    from ..models.response import APIResponse
+
+    return TypeAdapter(APIResponse[result_type])
+
+
+def decode_response(
+    body: bytes,
+    result_type: Type,
+    loads: Optional[Callable[[bytes], Any]] = None,
+) -> "APIResponse":
+    """Decode response body straight into the typed envelope
+
+    Args:
+        body (bytes): Raw response body
+        result_type (Type): Type of the `result` field, e.g. List[Invoice]
+        loads (Optional[Callable[[bytes], Any]], optional): JSON backend. By default pydantic parses the bytes itself in one pass.
+
+    Returns:
+        APIResponse: Envelope with typed result
+    """
+    adapter = get_response_adapter(result_type)
+    if loads is None:
+        return adapter.validate_json(body)
+    return adapter.validate_python(loads(body))
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from .cache import TTLCache
+
+
+class BaseDedupStorage(ABC):
+    """
+    Storage of seen webhook update IDs.
+        Subclass it and implement `add` and `discard` to share the state between
+        processes, e.g. with Redis `SET update_id 1 NX EX ttl` and `DEL update_id`.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def add(self, update_id: int) -> bool:
+        """Remember update ID. Returns False if it was already stored."""
+
+    @abstractmethod
+    async def discard(self, update_id: int) -> None:
+        """Forget update ID, so a retry of the update is processed again."""
+
+    async def is_duplicate(self, update_id: int) -> bool:
+        """Remember update ID and count dedup hit or miss."""
+        if await self.add(update_id):
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class MemoryDedupStorage(BaseDedupStorage):
+    """In-process dedup storage bounded by size and age"""
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = 86400) -> None:
+        """
+        Init storage
+            :param maxsize: max remembered update IDs
+            :param ttl: seconds an update ID is remembered
+        """
+        super().__init__()
+        self._seen: TTLCache[int, bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def add(self, update_id: int) -> bool:
+        if update_id in self._seen:
+            return False
+        self._seen.set(update_id, True)
+        return True
+
+    async def discard(self, update_id: int) -> None:
+        self._seen.pop(update_id)
+
+    def update_ids(self) -> List[int]:
+        """Remembered update IDs from the least to the most recently seen"""
+        return list(self._seen)
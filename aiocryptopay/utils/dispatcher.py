@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional
+
+if TYPE_CHECKING:
+    from ..models.update import Update
+
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[["Update", Any], Awaitable[Any]]
+
+
+class UpdateDispatcher:
+    """Runs update handlers in a pool of worker tasks fed by a bounded queue"""
+
+    def __init__(
+        self, handlers: List[Handler], workers: int = 4, queue_size: int = 1000
+    ) -> None:
+        """
+        Init dispatcher
+            :param handlers: handlers list, later registrations are picked up too
+            :param workers: number of worker tasks processing updates concurrently
+            :param queue_size: max queued updates. When the queue is full
+                `put` waits, which delays the webhook response (backpressure).
+        """
+        self._handlers = handlers
+        self._workers_count = max(workers, 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_size = queue_size
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        """Number of updates waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start worker tasks. Called on the first update."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._workers = [
+            asyncio.ensure_future(self._work()) for _ in range(self._workers_count)
+        ]
+
+    async def put(self, update: Update, app: Any = None) -> None:
+        """Queue an update, waiting while the queue is full."""
+        self.start()
+        await self._queue.put((update, app))
+
+    async def _work(self) -> None:
+        while True:
+            update, app = await self._queue.get()
+            try:
+                await self._handle(update, app)
+            finally:
+                self._queue.task_done()
+
+    async def _handle(self, update: Update, app: Any) -> None:
+        for handler in self._handlers:
+            try:
+                await handler(update, app)
+            except Exception:
+                logger.exception(
+                    "Handler %r failed on update %s", handler, update.update_id
+                )
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until queued updates are handled and stop the workers.
+            :param timeout: max seconds to wait for the queue to drain, None to wait forever
+        """
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Updates not drained on close: %d queued dropped, running handlers cancelled",
+                self._queue.qsize(),
+            )
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
@@ -1,6 +1,13 @@
-from typing import List, Union
+from __future__ import annotations
 
-from ..models.rates import ExchangeRate
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from ..models.rates import ExchangeRate
+
+
+NAN = float("nan")
 
 
 def get_rate(source: str, target: str, rates: List[ExchangeRate]) -> ExchangeRate:
@@ -19,6 +26,18 @@ def get_rate(source: str, target: str, rates: List[ExchangeRate]) -> ExchangeRat
             return rate
 
 
+def index_rates(rates: List[ExchangeRate]) -> Dict[Tuple[str, str], ExchangeRate]:
+    """Index rates by (source, target) pair
+
+    Args:
+        rates (List[ExchangeRate]): Exchange rates
+
+    Returns:
+        Dict[Tuple[str, str], ExchangeRate]: Rates by (source, target)
+    """
+    return {(rate.source, rate.target): rate for rate in rates}
+
+
 def get_rate_summ(summ: Union[int, float], rate: ExchangeRate) -> Union[int, float]:
     """Get rate summ
 
@@ -30,3 +49,126 @@ def get_rate_summ(summ: Union[int, float], rate: ExchangeRate) -> Union[int, flo
         Union[int, float]: _description_
     """
     return summ / rate.rate
+
+
+class RateMatrix:
+    """Exchange rates between every pair of currencies
+
+    Built from ExchangeRate lists. Rates with is_valid=False are skipped,
+    each rate is also used in reverse, and pairs without a direct rate are
+    crossed through the pivot currencies, e.g. EUR -> USD -> TON.
+    Pairs which still can't be priced are NaN.
+
+    Args:
+        rates (List[ExchangeRate]): Exchange rates
+        pivots (Sequence[str], optional): Currencies to cross rates through, in order of preference. Defaults to ("USD", "USDT").
+    """
+
+    def __init__(
+        self, rates: List[ExchangeRate], pivots: Sequence[str] = ("USD", "USDT")
+    ) -> None:
+        valid = [rate for rate in rates if rate.is_valid and rate.rate]
+        codes = {str(rate.source) for rate in valid} | {
+            str(rate.target) for rate in valid
+        }
+        self.currencies: List[str] = sorted(codes)
+        self._index: Dict[str, int] = {
+            code: index for index, code in enumerate(self.currencies)
+        }
+
+        size = len(self.currencies)
+        matrix = [[NAN] * size for _ in range(size)]
+        for index in range(size):
+            matrix[index][index] = 1.0
+        for rate in valid:
+            source, target = (
+                self._index[str(rate.source)],
+                self._index[str(rate.target)],
+            )
+            matrix[source][target] = float(rate.rate)
+            if math.isnan(matrix[target][source]):
+                matrix[target][source] = 1 / float(rate.rate)
+
+        for pivot in pivots:
+            through = self._index.get(pivot)
+            if through is None:
+                continue
+            to_pivot = [row[through] for row in matrix]
+            from_pivot = matrix[through]
+            for source in range(size):
+                row = matrix[source]
+                for target in range(size):
+                    if math.isnan(row[target]):
+                        row[target] = to_pivot[source] * from_pivot[target]
+
+        self._matrix = matrix
+        self._array = None
+
+    def __contains__(self, code: str) -> bool:
+        return str(code) in self._index
+
+    def rate(self, source: str, target: str) -> Optional[float]:
+        """Amount of target currency per one source currency, None if it can't be priced
+
+        Args:
+            source (str): Source currency code
+            target (str): Target currency code
+
+        Returns:
+            Optional[float]: Rate
+        """
+        index = self._index
+        if str(source) not in index or str(target) not in index:
+            return None
+        rate = self._matrix[index[str(source)]][index[str(target)]]
+        return None if math.isnan(rate) else rate
+
+    def convert(
+        self,
+        amounts: Sequence[Union[int, float]],
+        source: Union[str, Sequence[str]],
+        targets: Sequence[str],
+        as_array: bool = False,
+    ) -> Any:
+        """Convert many amounts into many currencies at once
+
+        Returns a list of rows, or a 2-D NumPy array with `as_array`.
+        Unpriced pairs are NaN.
+
+        Args:
+            amounts (Sequence[Union[int, float]]): Amounts, e.g. fiat prices
+            source (Union[str, Sequence[str]]): Currency of all amounts or of each amount
+            targets (Sequence[str]): Currencies to convert into, e.g. ["TON", "USDT"]
+            as_array (bool, optional): Convert with NumPy and return an array. Defaults to False.
+
+        Returns:
+            Any: List of rows or NumPy array, row per amount with a column per target currency
+
+        Raises:
+            KeyError: Unknown currency code
+            ImportError: `as_array` without NumPy installed
+        """
+        sources = (
+            [self._index[str(source)]] * len(amounts)
+            if isinstance(source, str)
+            else [self._index[str(code)] for code in source]
+        )
+        if len(sources) != len(amounts):
+            raise ValueError("source must be a code or a code per amount")
+        columns = [self._index[str(code)] for code in targets]
+
+        if as_array:
+            try:
+                import numpy
+            except ImportError:
+                raise ImportError("as_array requires numpy: pip install numpy")
+            if self._array is None:
+                self._array = numpy.array(self._matrix, dtype=float)
+            rates = self._array[numpy.ix_(sources, columns)]
+            return numpy.asarray(amounts, dtype=float)[:, None] * rates
+
+        matrix = self._matrix
+        return [
+            [amount * matrix[row][column] for column in columns]
+            for amount, row in zip(amounts, sources)
+        ]
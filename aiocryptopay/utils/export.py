@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import csv
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+)
+
+from .pagination import paginate
+from .snapshot import PathLike
+
+if TYPE_CHECKING:
+    from ..api import AioCryptoPay
+
+
+# API method and model of every exportable kind of objects
+EXPORT_KINDS = {
+    "invoices": ("getInvoices", "Invoice"),
+    "transfers": ("getTransfers", "Transfer"),
+    "checks": ("getChecks", "Check"),
+}
+
+
+class Exporter:
+    """
+    Streaming export of invoices, transfers or checks.
+        Pages are read as plain dicts, without building models, and each item
+        is cut down to the selected fields as soon as its page arrives.
+        Only the current and the prefetched pages are held in memory,
+        rows are written page by page.
+    """
+
+    def __init__(
+        self,
+        client: AioCryptoPay,
+        kind: str = "invoices",
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = 1000,
+        prefetch: int = 2,
+        **filters: Any,
+    ) -> None:
+        """
+        Init exporter
+            :param client: API client
+            :param kind: "invoices", "transfers" or "checks"
+            :param fields: fields to export in column order, all model fields by default
+            :param page_size: items per request, up to 1000
+            :param prefetch: pages requested ahead
+            :param filters: API method params, e.g. asset="TON" or status="paid"
+        """
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(EXPORT_KINDS)}")
+        self.client = client
+        self.kind = kind
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.filters = filters
+        self.fields = list(fields) if fields else self.model_fields(kind)
+
+    @staticmethod
+    def model_fields(kind: str) -> List[str]:
+        """All fields of the model of `kind`"""
+        from .. import models
+
+        return list(getattr(models, EXPORT_KINDS[kind][1]).model_fields)
+
+    async def _fetch_page(self, offset: int, count: int) -> List[Dict[str, Any]]:
+        method = EXPORT_KINDS[self.kind][0]
+        params = {**self.filters, "offset": offset, "count": count}
+        response = await self.client._call(method, params=params)
+        fields = self.fields
+        return [
+            {field: item.get(field) for field in fields}
+            for item in response["result"]["items"]
+        ]
+
+    async def pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Rows page by page"""
+        page: List[Dict[str, Any]] = []
+        async for row in paginate(
+            self._fetch_page, offset=0, count=self.page_size, prefetch=self.prefetch
+        ):
+            page.append(row)
+            if len(page) >= self.page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    async def rows(self) -> AsyncIterator[Dict[str, Any]]:
+        """Rows with the selected fields"""
+        async for page in self.pages():
+            for row in page:
+                yield row
+
+    async def to_ndjson(self, path: PathLike) -> int:
+        """
+        Write one JSON object per line
+            :param path: output file
+            :return: number of rows written
+        """
+        with open(path, "w", encoding="UTF-8") as file:
+            return await self._write_ndjson(file)
+
+    async def _write_ndjson(self, file: TextIO) -> int:
+        written = 0
+        async for page in self.pages():
+            file.write(
+                "".join(
+                    json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+                    for row in page
+                )
+            )
+            written += len(page)
+        return written
+
+    async def to_csv(self, path: PathLike) -> int:
+        """
+        Write CSV with a header row. Lists are joined by comma, objects are written as JSON.
+            :param path: output file
+            :return: number of rows written
+        """
+        with open(path, "w", encoding="UTF-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.fields)
+            written = 0
+            async for page in self.pages():
+                writer.writerows(
+                    [_csv_value(row[field]) for field in self.fields] for row in page
+                )
+                written += len(page)
+        return written
+
+    async def to_parquet(self, path: PathLike, row_group_size: int = 10000) -> int:
+        """
+        Write Parquet, requires pyarrow.
+            Column types are inferred from the first page, columns empty on it are strings.
+            :param path: output file
+            :param row_group_size: rows buffered before a row group is written
+            :return: number of rows written
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+
+        writer = None
+        schema = None
+        buffer: List[Dict[str, Any]] = []
+        written = 0
+
+        def flush() -> None:
+            nonlocal writer, schema
+            if schema is None:
+                schema = _parquet_schema(pyarrow, self.fields, buffer)
+                writer = pyarrow.parquet.ParquetWriter(path, schema)
+            columns = {
+                field: [
+                    _parquet_value(row[field], schema.field(field).type, pyarrow)
+                    for row in buffer
+                ]
+                for field in self.fields
+            }
+            writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema))
+            buffer.clear()
+
+        try:
+            async for page in self.pages():
+                buffer.extend(page)
+                written += len(page)
+                if len(buffer) >= row_group_size:
+                    flush()
+            if buffer or writer is None:
+                flush()
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return ",".join(map(str, value))
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _parquet_schema(pyarrow: Any, fields: Sequence[str], rows: List[Dict[str, Any]]):
+    types = []
+    for field in fields:
+        value = next((row[field] for row in rows if row[field] is not None), None)
+        if isinstance(value, bool):
+            arrow_type = pyarrow.bool_()
+        elif isinstance(value, int):
+            arrow_type = pyarrow.int64()
+        elif isinstance(value, float):
+            arrow_type = pyarrow.float64()
+        else:
+            arrow_type = pyarrow.string()
+        types.append(pyarrow.field(field, arrow_type))
+    return pyarrow.schema(types)
+
+
+def _parquet_value(value: Any, arrow_type: Any, pyarrow: Any) -> Any:
+    if value is None or not pyarrow.types.is_string(arrow_type):
+        return value
+    if isinstance(value, (list, dict)):
+        return _csv_value(value)
+    return value if isinstance(value, str) else str(value)
@@ -0,0 +1,30 @@
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional
+
+
+class LatencyWindow:
+    """Recent latencies by key for percentile estimates"""
+
+    def __init__(self, size: int = 100, min_samples: int = 20) -> None:
+        """
+        Init window
+            :param size: latencies kept per key
+            :param min_samples: latencies needed before a quantile is estimated
+        """
+        self.size = size
+        self.min_samples = min_samples
+        self._samples: Dict[Hashable, Deque[float]] = {}
+
+    def observe(self, key: Hashable, latency: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.size)
+        samples.append(latency)
+
+    def quantile(self, key: Hashable, q: float) -> Optional[float]:
+        """Latency below which `q` share of recent requests finished, None until enough samples"""
+        samples = self._samples.get(key)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
@@ -0,0 +1,219 @@
+from collections import defaultdict
+from time import perf_counter
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession, TraceConfig
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Fixed bucket histogram of durations in seconds"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        """Counts of observations less than or equal to each bucket bound"""
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class BaseMetrics:
+    """
+    Instrumentation hooks of the client, all of them do nothing.
+        Subclass it to send measurements elsewhere, e.g. to statsd.
+        The client calls the hooks only when it is created with `metrics`,
+        otherwise no timers or trace callbacks are set up at all.
+
+        Request phases reported to `on_phase`:
+            queue: waiting for a free connection in the pool
+            dns: resolving the host
+            connect: opening a new connection, including the TLS handshake
+            ttfb: from sending the request to the response headers
+            read: reading the response body
+            decode: parsing JSON
+            build: building models. Validated typed responses are parsed and
+                built by pydantic in one pass, reported as build.
+    """
+
+    def on_request_start(self, endpoint: str) -> None:
+        """HTTP request to API method `endpoint` is sent"""
+
+    def on_request_end(
+        self, endpoint: str, duration: float, error: Optional[BaseException] = None
+    ) -> None:
+        """HTTP request is done, `error` is set when it raised"""
+
+    def on_phase(self, endpoint: str, phase: str, duration: float) -> None:
+        """Request phase `phase` took `duration` seconds"""
+
+    def trace_config(self) -> "TraceConfig":
+        """aiohttp trace config reporting connection and response phases"""
+        from aiohttp import TraceConfig
+
+        trace_config = TraceConfig()
+
+        async def on_request_start(
+            session: "ClientSession", context: SimpleNamespace, params
+        ) -> None:
+            context.endpoint = params.url.name
+            context.started = {"ttfb": perf_counter()}
+
+        def phase_start(phase: str):
+            async def handler(
+                session: "ClientSession", context: SimpleNamespace, params
+            ) -> None:
+                context.started[phase] = perf_counter()
+
+            return handler
+
+        def phase_end(phase: str):
+            async def handler(
+                session: "ClientSession", context: SimpleNamespace, params
+            ) -> None:
+                started = context.started.pop(phase, None)
+                if started is not None:
+                    self.on_phase(context.endpoint, phase, perf_counter() - started)
+
+            return handler
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(phase_start("queue"))
+        trace_config.on_connection_queued_end.append(phase_end("queue"))
+        trace_config.on_dns_resolvehost_start.append(phase_start("dns"))
+        trace_config.on_dns_resolvehost_end.append(phase_end("dns"))
+        trace_config.on_connection_create_start.append(phase_start("connect"))
+        trace_config.on_connection_create_end.append(phase_end("connect"))
+        trace_config.on_request_end.append(phase_end("ttfb"))
+        return trace_config
+
+
+class Metrics(BaseMetrics):
+    """
+    In-process metrics: latency histograms, phase breakdowns,
+        in-flight gauges and error counters by API method.
+        Export them with `to_prometheus`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Init metrics
+            :param buckets: upper bounds of histogram buckets in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.latency: Dict[str, Histogram] = {}
+        self.phases: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def on_request_start(self, endpoint: str) -> None:
+        self.in_flight[endpoint] += 1
+        self.requests[endpoint] += 1
+
+    def on_request_end(
+        self, endpoint: str, duration: float, error: Optional[BaseException] = None
+    ) -> None:
+        self.in_flight[endpoint] -= 1
+        self._histogram(self.latency, endpoint).observe(duration)
+        if error is not None:
+            code = getattr(error, "code", None)
+            name = getattr(error, "name", None) if code is not None else None
+            key = (endpoint, str(code or ""), name or type(error).__name__)
+            self.errors[key] += 1
+
+    def on_phase(self, endpoint: str, phase: str, duration: float) -> None:
+        self._histogram(self.phases, (endpoint, phase)).observe(duration)
+
+    def _histogram(self, histograms: dict, key) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def reset(self) -> None:
+        """Forget all measurements except requests in flight"""
+        self.latency.clear()
+        self.phases.clear()
+        self.requests.clear()
+        self.errors.clear()
+
+    def to_prometheus(self, prefix: str = "aiocryptopay") -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        def histogram(name: str, labels: Dict[str, str], value: Histogram) -> None:
+            for bound, count in zip(value.buckets, value.cumulative()):
+                bucket_labels = {**labels, "le": _format_float(bound)}
+                lines.append(f"{name}_bucket{_labels(bucket_labels)} {count}")
+            lines.append(
+                f'{name}_bucket{_labels({**labels, "le": "+Inf"})} {value.count}'
+            )
+            lines.append(f"{name}_sum{_labels(labels)} {_format_float(value.sum)}")
+            lines.append(f"{name}_count{_labels(labels)} {value.count}")
+
+        name = header("requests_total", "counter", "HTTP requests by API method")
+        for endpoint, count in sorted(self.requests.items()):
+            lines.append(f"{name}{_labels({'endpoint': endpoint})} {count}")
+
+        name = header(
+            "requests_in_flight", "gauge", "HTTP requests waiting for a response"
+        )
+        for endpoint, count in sorted(self.in_flight.items()):
+            lines.append(f"{name}{_labels({'endpoint': endpoint})} {count}")
+
+        name = header(
+            "request_errors_total", "counter", "Failed requests by API error code"
+        )
+        for (endpoint, code, error), count in sorted(self.errors.items()):
+            labels = {"endpoint": endpoint, "code": code, "error": error}
+            lines.append(f"{name}{_labels(labels)} {count}")
+
+        name = header("request_duration_seconds", "histogram", "HTTP request latency")
+        for endpoint, value in sorted(self.latency.items()):
+            histogram(name, {"endpoint": endpoint}, value)
+
+        name = header(
+            "request_phase_duration_seconds", "histogram", "HTTP request phase latency"
+        )
+        for (endpoint, phase), value in sorted(self.phases.items()):
+            histogram(name, {"endpoint": endpoint, "phase": phase}, value)
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
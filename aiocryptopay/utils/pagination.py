@@ -0,0 +1,61 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, List, TypeVar
+
+
+T = TypeVar("T")
+
+PageFetcher = Callable[[int, int], Awaitable[List[T]]]
+
+
+async def paginate(
+    fetch_page: PageFetcher,
+    offset: int = 0,
+    count: int = 100,
+    prefetch: int = 2,
+) -> AsyncIterator[T]:
+    """Iterate over offset/count paginated items
+
+    Pages are requested ahead of the consumer: up to `prefetch` pages
+    after the current one are in flight at any time. Iteration stops on
+    the first page shorter than `count`, pending requests are cancelled.
+
+    Args:
+        fetch_page (PageFetcher): Coroutine function taking offset and count and returning a page.
+        offset (int): Offset of the first item. Defaults to 0.
+        count (int): Page size. Defaults to 100.
+        prefetch (int): Number of pages requested ahead. Defaults to 2.
+
+    Yields:
+        T: Page items in order
+    """
+    if count < 1:
+        raise ValueError("count must be positive")
+
+    pending: Deque[asyncio.Future] = deque()
+    next_offset = offset
+
+    def schedule() -> None:
+        nonlocal next_offset
+        pending.append(asyncio.ensure_future(fetch_page(next_offset, count)))
+        next_offset += count
+
+    try:
+        for _ in range(max(prefetch, 0) + 1):
+            schedule()
+
+        while pending:
+            page = await pending.popleft()
+            if len(page) < count:
+                for item in page:
+                    yield item
+                break
+
+            schedule()
+            for item in page:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,314 @@
+import asyncio
+import inspect
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .batch import run_batch
+from .snapshot import PathLike
+
+if TYPE_CHECKING:
+    from ..api import AioCryptoPay
+    from ..models import Transfer
+
+
+T = TypeVar("T")
+
+ATTEMPT = "attempt"
+SENT = "sent"
+FAILED = "failed"
+# No response, a server error or rate limited: the transfer may have been
+# made or may still be made, it is retried on every run
+UNKNOWN = "unknown"
+
+
+class PayoutJournal:
+    """
+    Append-only SQLite journal of payout attempts and results.
+        Every event is committed before the call returns, so after a crash the
+        journal tells which spend_ids were sent, rejected, left with an unknown
+        outcome or in flight.
+        Queries run in a dedicated thread to keep the event loop free.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """
+        Init journal
+            :param path: SQLite database file, created if missing
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="payout-journal"
+        )
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS payout_events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "spend_id TEXT NOT NULL, "
+                "event TEXT NOT NULL, "
+                "data TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS payout_events_spend_id "
+                "ON payout_events (spend_id, id)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _append(self, spend_id: str, event: str, data: Optional[dict]) -> None:
+        connection = self._connect()
+        connection.execute(
+            "INSERT INTO payout_events (spend_id, event, data, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (spend_id, event, json.dumps(data), time.time()),
+        )
+        connection.commit()
+
+    def _states(self) -> Dict[str, Tuple[str, Optional[dict], int]]:
+        states: Dict[str, Tuple[str, Optional[dict], int]] = {}
+        rows = self._connect().execute(
+            "SELECT spend_id, event, data FROM payout_events ORDER BY id"
+        )
+        for spend_id, event, data in rows:
+            attempts = states[spend_id][2] if spend_id in states else 0
+            if event == ATTEMPT:
+                attempts += 1
+            states[spend_id] = (event, json.loads(data), attempts)
+        return states
+
+    async def append(
+        self, spend_id: str, event: str, data: Optional[dict] = None
+    ) -> None:
+        """Append an event of spend_id and commit it"""
+        await self._run(self._append, spend_id, event, data)
+
+    async def states(self) -> Dict[str, Tuple[str, Optional[dict], int]]:
+        """Last event, its data and the number of attempts by spend_id"""
+        return await self._run(self._states)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._run(self._connection.close)
+            self._connection = None
+        self._executor.shutdown(wait=False)
+
+
+@dataclass
+class PayoutResult:
+    """Outcome of one payout"""
+
+    spend_id: str
+    request: Mapping[str, Any]
+    status: str
+    transfer: Optional["Transfer"] = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+    resumed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == SENT
+
+
+@dataclass
+class PayoutReport:
+    """Per-item outcomes and throughput of a payout run"""
+
+    results: List[PayoutResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> int:
+        """Payouts rejected by the API"""
+        return sum(1 for result in self.results if result.status == FAILED)
+
+    @property
+    def unknown(self) -> int:
+        """Payouts which may have been sent, run the batch again to resolve them"""
+        return sum(1 for result in self.results if result.status == UNKNOWN)
+
+    @property
+    def per_second(self) -> float:
+        """Transfers requested by this run per second"""
+        requested = sum(1 for result in self.results if result.attempts)
+        return requested / self.elapsed if self.elapsed else 0.0
+
+
+class PayoutBatch:
+    """
+    Bulk payouts with a durable spend_id journal.
+        Transfers run concurrently under a limit. Each attempt is journaled
+        before the request and each result after it. Only 4xx API errors and
+        invalid arguments are failures, after rate limiting, timeouts, connection
+        and server errors the outcome is unknown. Running the same payouts again
+        skips the sent ones and retries the rest with the same spend_id, which
+        the API accepts only once.
+    """
+
+    def __init__(
+        self,
+        client: "AioCryptoPay",
+        journal: Union[PayoutJournal, PathLike],
+        concurrency: int = 10,
+        retry_failed: bool = True,
+    ) -> None:
+        """
+        Init batch
+            :param client: API client
+            :param journal: journal or path of its SQLite file
+            :param concurrency: max transfers in flight
+            :param retry_failed: retry payouts rejected in a previous run, otherwise report them as failed,
+                payouts with an unknown outcome are always retried
+        """
+        self.client = client
+        self.journal = (
+            journal if isinstance(journal, PayoutJournal) else PayoutJournal(journal)
+        )
+        self.concurrency = concurrency
+        self.retry_failed = retry_failed
+
+    async def run(self, payouts: Iterable[Mapping[str, Any]]) -> PayoutReport:
+        """
+        Send payouts
+            :param payouts: transfer keyword arguments for every payout, each with a unique spend_id
+            :return: outcome of every payout in input order
+        """
+        payouts = list(payouts)
+        spend_ids = [str(payout["spend_id"]) for payout in payouts]
+        if len(set(spend_ids)) != len(spend_ids):
+            raise ValueError("spend_id of every payout must be unique")
+
+        started_at = time.perf_counter()
+        states = await self.journal.states()
+        results: List[Optional[PayoutResult]] = [None] * len(payouts)
+        pending = []
+        for index, (spend_id, payout) in enumerate(zip(spend_ids, payouts)):
+            state = states.get(spend_id)
+            if state is None:
+                pending.append((index, spend_id, payout, 0))
+                continue
+            event, data, attempts = state
+            if event == SENT or (event == FAILED and not self.retry_failed):
+                results[index] = self._restore(spend_id, payout, event, data)
+            else:
+                pending.append((index, spend_id, payout, attempts))
+
+        async for item in run_batch(self._send, pending, self.concurrency):
+            if not item.ok:
+                # The journal failed, outcomes can't be recorded any more
+                raise item.error
+            results[item.request[0]] = item.result
+
+        return PayoutReport(
+            results=[result for result in results if result is not None],
+            elapsed=time.perf_counter() - started_at,
+        )
+
+    async def _send(
+        self, item: Tuple[int, str, Mapping[str, Any], int]
+    ) -> PayoutResult:
+        index, spend_id, payout, attempts = item
+        resumed = attempts > 0
+        try:
+            inspect.signature(self.client.transfer).bind(**payout)
+        except TypeError as error:
+            # Invalid transfer arguments, nothing is sent
+            await self.journal.append(spend_id, FAILED, _error_data(error))
+            return PayoutResult(spend_id, payout, FAILED, error=error, resumed=resumed)
+
+        await self.journal.append(spend_id, ATTEMPT, {"index": index})
+        try:
+            transfer = await self.client.transfer(**payout)
+        except Exception as error:
+            status = FAILED if _is_rejection(error) else UNKNOWN
+            await self.journal.append(spend_id, status, _error_data(error))
+            return PayoutResult(
+                spend_id, payout, status, error=error, attempts=1, resumed=resumed
+            )
+        await self.journal.append(
+            spend_id, SENT, {"transfer": self.client._dump_model(transfer)}
+        )
+        return PayoutResult(
+            spend_id, payout, SENT, transfer=transfer, attempts=1, resumed=resumed
+        )
+
+    @staticmethod
+    def _restore(
+        spend_id: str,
+        payout: Mapping[str, Any],
+        event: str,
+        data: Optional[dict],
+    ) -> PayoutResult:
+        """Result of a payout finished by a previous run"""
+        from ..exceptions import CryptoPayAPIError
+        from ..models import Transfer
+
+        if event == SENT:
+            transfer = Transfer.model_validate(data["transfer"])
+            return PayoutResult(spend_id, payout, SENT, transfer=transfer, resumed=True)
+        if data["code"] is not None:
+            error = CryptoPayAPIError(data["code"], data["name"])
+        else:
+            # Invalid transfer arguments, see _send
+            error = TypeError(data.get("message") or data["name"])
+        return PayoutResult(spend_id, payout, FAILED, error=error, resumed=True)
+
+    async def close(self) -> None:
+        await self.journal.close()
+
+    async def __aenter__(self) -> "PayoutBatch":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+def _is_rejection(error: Exception) -> bool:
+    """4xx API error except rate limiting, the transfer was not made"""
+    from ..exceptions import CodeErrorFactory
+
+    return (
+        isinstance(error, CodeErrorFactory)
+        and error.code is not None
+        and 400 <= error.code < 500
+        and error.code != 429
+    )
+
+
+def _error_data(error: Exception) -> Dict[str, Any]:
+    return {
+        "code": getattr(error, "code", None),
+        "name": getattr(error, "name", None) or type(error).__name__,
+        "message": str(error),
+    }
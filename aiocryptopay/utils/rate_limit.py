@@ -0,0 +1,34 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Init token bucket
+            :param rate: tokens added per second
+            :param capacity: max tokens stored, allows bursts. Defaults to `rate` (at least 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        """
+        Take one token, waiting until it is available.
+            Tokens are reserved in call order, so waiters are served FIFO.
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
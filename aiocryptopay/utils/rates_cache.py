@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .exchange import RateMatrix, index_rates
+
+if TYPE_CHECKING:
+    from ..models.rates import ExchangeRate
+
+
+class ExchangeRatesCache:
+    """TTL cache of exchange rates indexed by (source, target) pair"""
+
+    def __init__(
+        self,
+        fetcher: Callable[[], Awaitable[List[ExchangeRate]]],
+        ttl: float = 60,
+        max_staleness: float = 300,
+    ) -> None:
+        """
+        Init exchange rates cache
+            :param fetcher: coroutine function that returns fresh rates
+            :param ttl: seconds during which cached rates are served as is
+            :param max_staleness: seconds after which cached rates are never served.
+                Between `ttl` and `max_staleness` the stale rates are returned
+                and a refresh is started in the background.
+        """
+        self._fetcher = fetcher
+        self.ttl = ttl
+        self.max_staleness = max(ttl, max_staleness)
+        self._rates: List[ExchangeRate] = []
+        self._index: Dict[Tuple[str, str], ExchangeRate] = {}
+        self._matrix: Optional[RateMatrix] = None
+        self._updated_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def rates(self) -> List[ExchangeRate]:
+        """Last fetched rates"""
+        return self._rates
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last refresh or None if the cache is empty"""
+        if self._updated_at is None:
+            return None
+        return time.monotonic() - self._updated_at
+
+    def set(self, rates: List[ExchangeRate], age: float = 0) -> None:
+        """
+        Replace cached rates.
+            :param rates: exchange rates
+            :param age: how many seconds ago the rates were fetched
+        """
+        self._rates = list(rates)
+        self._index = index_rates(self._rates)
+        self._matrix = None
+        self._updated_at = time.monotonic() - age
+
+    def refresh(self) -> asyncio.Task[Dict[Tuple[str, str], ExchangeRate]]:
+        """Start a refresh or return the one already in flight."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    async def _refresh(self) -> Dict[Tuple[str, str], ExchangeRate]:
+        self.set(await self._fetcher())
+        return self._index
+
+    @staticmethod
+    def _on_refresh_done(task: asyncio.Task) -> None:
+        # Background refresh errors are surfaced to the next blocking caller.
+        if not task.cancelled():
+            task.exception()
+
+    async def get_index(self) -> Dict[Tuple[str, str], ExchangeRate]:
+        """Get rates indexed by (source, target), refreshing them if needed."""
+        age = self.age
+        if age is None or age >= self.max_staleness:
+            return await asyncio.shield(self.refresh())
+        if age >= self.ttl:
+            self.refresh()
+        return self._index
+
+    async def get_rate(self, source: str, target: str) -> Optional[ExchangeRate]:
+        """Get rate by source and target"""
+        index = await self.get_index()
+        return index.get((str(source), str(target)))
+
+    async def get_matrix(self) -> RateMatrix:
+        """Get cross rates of all currencies, refreshing the rates if needed."""
+        await self.get_index()
+        if self._matrix is None:
+            self._matrix = RateMatrix(self._rates)
+        return self._matrix
+
+    async def close(self) -> None:
+        """Cancel the refresh in flight."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Union
+
+
+SNAPSHOT_VERSION = 1
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def write_snapshot(path: PathLike, state: Dict[str, Any]) -> None:
+    """Write snapshot atomically
+
+    The state is written to a temporary file in the same directory,
+    flushed to disk and moved over the old snapshot, so readers see either
+    the old or the new file, never a partial one.
+
+    Args:
+        path (PathLike): Snapshot file
+        state (Dict[str, Any]): JSON serializable state
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    data = json.dumps(
+        {"version": SNAPSHOT_VERSION, **state}, separators=(",", ":")
+    ).encode("UTF-8")
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def read_snapshot(path: PathLike) -> Optional[Dict[str, Any]]:
+    """Read snapshot
+
+    Args:
+        path (PathLike): Snapshot file
+
+    Returns:
+        Optional[Dict[str, Any]]: State or None if the file is missing, unreadable or of another version
+    """
+    try:
+        with open(path, "rb") as file:
+            state = json.loads(file.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION:
+        return None
+    return state
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+from .concurrency import gather_limited
+
+if TYPE_CHECKING:
+    from ..api import AioCryptoPay
+    from ..models import AppStats
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+Window = Tuple[datetime, datetime]
+
+
+class StatsAggregator:
+    """
+    App statistics over long ranges from cached fixed windows.
+        Ranges are split into windows aligned to `window` since the Unix epoch,
+        the first and the last ones are cut to the range bounds. Missing windows
+        are fetched concurrently. Closed windows are cached for good, so repeated
+        dashboard queries only request the windows at the range bounds.
+    """
+
+    def __init__(
+        self,
+        client: AioCryptoPay,
+        window: timedelta = timedelta(days=1),
+        settle_delay: timedelta = timedelta(minutes=5),
+        concurrency: int = 4,
+    ) -> None:
+        """
+        Init aggregator
+            :param client: API client
+            :param window: window length
+            :param settle_delay: time after the end of a window before it is cached,
+                so late updates of its invoices are counted
+            :param concurrency: max getStats requests in flight
+        """
+        if window <= timedelta(0):
+            raise ValueError("window must be positive")
+        self.client = client
+        self.window = window
+        self.settle_delay = settle_delay
+        self.concurrency = concurrency
+        self._closed: Dict[Window, AppStats] = {}
+
+    def windows(self, start_at: datetime, end_at: datetime) -> List[Window]:
+        """Aligned windows covering exactly the range, the first and the last are cut to its bounds"""
+        window_start, end_at = _utc(start_at), _utc(end_at)
+        windows = []
+        while window_start < end_at:
+            boundary = EPOCH + (window_start - EPOCH) // self.window * self.window
+            window_end = min(boundary + self.window, end_at)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows
+
+    async def get(
+        self,
+        start_at: Union[datetime, str],
+        end_at: Optional[Union[datetime, str]] = None,
+    ) -> AppStats:
+        """
+        Get app statistics of the range
+            :param start_at: range start
+            :param end_at: range end, now by default
+            :return: merged statistics, see `merge`
+        """
+        now = datetime.now(timezone.utc)
+        end_at = _utc(end_at) if end_at is not None else now
+        windows = self.windows(_utc(start_at), end_at)
+        if not windows:
+            raise ValueError("start_at must be before end_at")
+
+        missing = [window for window in windows if window not in self._closed]
+        fetched = await gather_limited(
+            [lambda window=window: self._fetch(window) for window in missing],
+            self.concurrency,
+        )
+        stats = dict(zip(missing, fetched))
+        for window, window_stats in stats.items():
+            if window[1] <= now - self.settle_delay:
+                self._closed[window] = window_stats
+
+        return self.merge(
+            [self._closed.get(window) or stats[window] for window in windows]
+        )
+
+    async def _fetch(self, window: Window) -> AppStats:
+        return await self.client.get_stats(
+            start_at=_isoformat(window[0]), end_at=_isoformat(window[1])
+        )
+
+    @staticmethod
+    def merge(windows: Sequence[AppStats]) -> AppStats:
+        """
+        Merge statistics of consecutive windows.
+            Volume and invoice counts are summed, conversion is weighted by created
+            invoices. Unique users are summed too, so a user active in several
+            windows is counted several times: the result is an upper bound.
+        """
+        from ..models import AppStats
+
+        created = sum(stats.created_invoice_count for stats in windows)
+        conversion = (
+            sum(stats.conversion * stats.created_invoice_count for stats in windows)
+            / created
+            if created
+            else 0
+        )
+        return AppStats(
+            volume=sum(stats.volume for stats in windows),
+            conversion=conversion,
+            unique_users_count=sum(stats.unique_users_count for stats in windows),
+            created_invoice_count=created,
+            paid_invoice_count=sum(stats.paid_invoice_count for stats in windows),
+            start_at=windows[0].start_at,
+            end_at=windows[-1].end_at,
+        )
+
+    def clear(self) -> None:
+        """Forget cached windows"""
+        self._closed.clear()
+
+
+def _utc(moment: Union[datetime, str]) -> datetime:
+    """Aware UTC datetime, naive ones are taken as UTC"""
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _isoformat(moment: datetime) -> str:
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..const import InvoiceStatus
+
+if TYPE_CHECKING:
+    from ..api import AioCryptoPay
+
+
+logger = logging.getLogger(__name__)
+
+
+class InvoiceWatcher:
+    """
+    Polling alternative to webhooks.
+        Watched invoices are checked with batched getInvoices calls. Young invoices
+        are checked often, older ones less and less often. Paid invoices are passed
+        to the client pay handlers as `invoice_paid` updates with no update_id and
+        stop being watched once the handlers succeed, expired and deleted ones at once.
+        Paid invoices whose handlers failed are checked and passed again.
+    """
+
+    def __init__(
+        self,
+        client: AioCryptoPay,
+        min_interval: float = 2,
+        max_interval: float = 60,
+        interval_growth: float = 0.1,
+        concurrency: int = 4,
+        app: Any = None,
+    ) -> None:
+        """
+        Init watcher
+            :param client: client with registered pay handlers
+            :param min_interval: seconds between checks of a new invoice
+            :param max_interval: max seconds between checks of an old invoice
+            :param interval_growth: check interval as a share of the invoice watch time,
+                0.1 means an invoice watched for 10 minutes is checked every minute
+            :param concurrency: max getInvoices requests in flight
+            :param app: passed to the handlers instead of the aiohttp application
+        """
+        self._client = client
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval_growth = interval_growth
+        self.concurrency = concurrency
+        self._app = app
+        self._watched_since: Dict[int, float] = {}
+        self._next_check: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._watched_since)
+
+    @property
+    def watched(self) -> List[int]:
+        """Watched invoice IDs"""
+        return list(self._watched_since)
+
+    def watch(self, invoice_id: int) -> None:
+        """Start watching an invoice, e.g. right after it is created."""
+        now = time.monotonic()
+        self._watched_since.setdefault(invoice_id, now)
+        self._next_check.setdefault(invoice_id, now + self.min_interval)
+
+    def unwatch(self, invoice_id: int) -> None:
+        self._watched_since.pop(invoice_id, None)
+        self._next_check.pop(invoice_id, None)
+
+    def _get_interval(self, invoice_id: int, now: float) -> float:
+        age = now - self._watched_since[invoice_id]
+        return min(
+            self.max_interval, max(self.min_interval, age * self.interval_growth)
+        )
+
+    async def poll(self) -> int:
+        """
+        Check invoices which are due once.
+            :return: number of checked invoices
+        """
+        now = time.monotonic()
+        due = [
+            invoice_id
+            for invoice_id, next_check in self._next_check.items()
+            if next_check <= now
+        ]
+        if not due:
+            return 0
+
+        try:
+            invoices = await self._client.get_invoices_by_ids(
+                invoice_ids=due, concurrency=self.concurrency
+            )
+        except Exception:
+            logger.exception("Failed to check %d invoices", len(due))
+            for invoice_id in due:
+                if invoice_id in self._next_check:
+                    self._next_check[invoice_id] = now + self.min_interval
+            return 0
+
+        now = time.monotonic()
+        for invoice_id in due:
+            if invoice_id not in self._watched_since:
+                continue
+            invoice = invoices.get(invoice_id)
+            if invoice is None or invoice.status == InvoiceStatus.EXPIRED:
+                self.unwatch(invoice_id)
+            elif invoice.status == InvoiceStatus.PAID:
+                if await self._emit(invoice):
+                    self.unwatch(invoice_id)
+                elif invoice_id in self._next_check:
+                    self._next_check[invoice_id] = time.monotonic() + self.min_interval
+            else:
+                self._next_check[invoice_id] = now + self._get_interval(invoice_id, now)
+        return len(due)
+
+    async def _emit(self, invoice: Any) -> bool:
+        """Pass a paid invoice to the handlers, returns False if they failed."""
+        from ..models import Update
+
+        # Built without validation: the invoice is already a model or a trusted record.
+        # There is no update_id, as the update was not sent by Crypto Pay.
+        update = Update.model_construct(
+            update_id=None,
+            update_type="invoice_paid",
+            request_date=datetime.now(timezone.utc),
+            payload=invoice,
+        )
+        # Handlers are awaited here even with dispatch workers, whose queue
+        # would swallow their errors.
+        try:
+            for handler in self._client._handlers:
+                await handler(update, self._app)
+        except Exception:
+            logger.exception("Handler failed on invoice %s", invoice.invoice_id)
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self.poll()
+            now = time.monotonic()
+            next_check = min(self._next_check.values(), default=now + self.min_interval)
+            await asyncio.sleep(min(max(next_check - now, 0.05), self.min_interval))
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,72 @@
+"""
+Compare exception class lookup by the registry with the former heap scan.
+
+    python -m benchmarks.exceptions [--heap-objects 1000000]
+
+The heap is filled with empty lists first, since the scan cost grows with it.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from aiocryptopay.exceptions import CryptoPayAPIError
+from aiocryptopay.exceptions.factory import CodeErrorFactory
+
+
+CODES = [400, 401, 404, 429, 500]
+
+
+def gc_scan_lookup(code: int) -> type:
+    """Lookup of the previous releases, the whole heap is walked when no error of the code is alive"""
+    classname = CodeErrorFactory.generate_exc_classname(code)
+    for obj in gc.get_objects():
+        if obj.__class__.__name__ == classname:
+            return obj.__class__
+    return type(classname, (CodeErrorFactory,), {})
+
+
+def registry_lookup(code: int) -> type:
+    return CryptoPayAPIError(code)
+
+
+def raise_and_catch(code: int) -> type:
+    try:
+        raise CryptoPayAPIError(code, "BENCHMARK_ERROR")
+    except CryptoPayAPIError(code) as error:
+        return type(error)
+
+
+def measure(lookup: Callable[[int], type], rounds: int) -> Dict[str, float]:
+    started_at = time.perf_counter()
+    for index in range(rounds):
+        lookup(CODES[index % len(CODES)])
+    elapsed = time.perf_counter() - started_at
+    return {"rounds": rounds, "per_call_us": round(elapsed / rounds * 1e6, 3)}
+
+
+def run(heap_objects: int = 1000000, rounds: int = 100000) -> Dict[str, object]:
+    heap = [[] for _ in range(heap_objects)]
+    results = {
+        "heap_objects": len(gc.get_objects()),
+        "gc_scan": measure(gc_scan_lookup, max(rounds // 10000, len(CODES))),
+        "registry": measure(registry_lookup, rounds),
+        "raise_and_catch": measure(raise_and_catch, rounds),
+    }
+    del heap
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--heap-objects", type=int, default=1000000)
+    parser.add_argument("--rounds", type=int, default=100000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.heap_objects, args.rounds)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Check the package import cost against a budget.
+
+    python -m benchmarks.import_time [--budget-ms 40]
+
+Sums self import time of the aiocryptopay modules reported by
+`python -X importtime` (best of several runs) and fails if it is over
+the budget or if the webhook server, the models or the modules of optional
+utilities (sqlite3, csv) were imported eagerly.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+
+LAZY_MODULES = [
+    "aiohttp.web",
+    "pydantic",
+    "aiocryptopay.models.invoice",
+    "sqlite3",
+    "csv",
+]
+
+
+def measure() -> Dict[str, object]:
+    code = f"import aiocryptopay, sys, json; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    own_us = 0
+    total_us = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        name = name.strip()
+        if name.startswith("aiocryptopay"):
+            own_us += int(self_us)
+        if name == "aiocryptopay":
+            total_us = int(cumulative_us)
+    return {
+        "own_ms": own_us / 1000,
+        "total_ms": total_us / 1000,
+        "eager_modules": json.loads(process.stdout),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=40)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = [measure() for _ in range(args.runs)]
+    best = min(results, key=lambda result: result["own_ms"])
+    print(json.dumps(best))
+
+    if best["eager_modules"]:
+        print(f"eagerly imported: {best['eager_modules']}", file=sys.stderr)
+        return 1
+    if best["own_ms"] > args.budget_ms:
+        print(
+            f"over budget: {best['own_ms']:.1f} > {args.budget_ms} ms", file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Compare full validation with trusted lazy records on a 1000 invoices page.
+
+    python -m benchmarks.parse_models
+"""
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from aiocryptopay.models.invoice import Invoice
+from aiocryptopay.models.lazy import construct_lazy
+from aiocryptopay.models.response import Items
+from aiocryptopay.utils.decoding import decode_response, json_loads
+
+from .payloads import invoices_page
+
+
+def parse_validated(body: bytes) -> Any:
+    return decode_response(body, Items[Invoice]).result.items
+
+
+def parse_trusted(body: bytes) -> Any:
+    return construct_lazy(Items[Invoice], json_loads(body)["result"]).items
+
+
+def read_fields(invoices: Any) -> None:
+    for invoice in invoices:
+        invoice.invoice_id, invoice.status, invoice.payload
+
+
+def measure(
+    parse: Callable[[bytes], Any], body: bytes, rounds: int
+) -> Dict[str, float]:
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        read_fields(parse(body))
+        timings.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    invoices = parse(body)
+    read_fields(invoices)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del invoices
+
+    return {
+        "best_ms": min(timings) * 1000,
+        "retained_kb": retained / 1024,
+        "peak_kb": peak / 1024,
+    }
+
+
+def run(count: int = 1000, rounds: int = 20) -> Dict[str, Dict[str, float]]:
+    body = json.dumps(invoices_page(count)).encode("UTF-8")
+    return {
+        "validated": measure(parse_validated, body, rounds),
+        "trusted": measure(parse_trusted, body, rounds),
+    }
+
+
+if __name__ == "__main__":
+    results = run()
+    for name, result in results.items():
+        print(
+            f"{name:>10}: {result['best_ms']:8.2f} ms"
+            f"  retained {result['retained_kb']:8.1f} KiB"
+            f"  peak {result['peak_kb']:8.1f} KiB"
+        )
@@ -0,0 +1,173 @@
+"""Realistic Crypto Pay API objects for benchmarks"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+
+EPOCH = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def iso(moment: datetime) -> str:
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def invoice(invoice_id: int, status: str = None) -> Dict[str, Any]:
+    status = status or ("paid" if invoice_id % 3 == 0 else "active")
+    created_at = EPOCH + timedelta(minutes=invoice_id)
+    data = {
+        "invoice_id": invoice_id,
+        "hash": f"IV{invoice_id:010d}",
+        "currency_type": "crypto",
+        "asset": "USDT",
+        "amount": "12.5",
+        "bot_invoice_url": f"https://t.me/CryptoBot?start=IV{invoice_id:010d}",
+        "mini_app_invoice_url": f"https://t.me/CryptoBot/app?startapp=invoice-IV{invoice_id:010d}",
+        "web_app_invoice_url": f"https://app.send.tg/invoices/IV{invoice_id:010d}",
+        "description": f"Order #{invoice_id}",
+        "status": status,
+        "created_at": iso(created_at),
+        "allow_comments": True,
+        "allow_anonymous": False,
+        "payload": f'{{"order_id": {invoice_id}, "user_id": {invoice_id * 7}}}',
+        "accepted_assets": ["USDT", "TON", "BTC"],
+    }
+    if status == "paid":
+        data.update(
+            {
+                "paid_at": iso(created_at + timedelta(minutes=2)),
+                "paid_anonymously": False,
+                "paid_asset": "USDT",
+                "paid_amount": "12.5",
+                "paid_usd_rate": "1.0001",
+                "fee_asset": "USDT",
+                "fee_amount": 0.375,
+                "fee_in_usd": "0.375",
+            }
+        )
+    return data
+
+
+def invoices_page(count: int = 1000, offset: int = 0) -> Dict[str, Any]:
+    return {
+        "ok": True,
+        "result": {
+            "items": [invoice(i) for i in range(offset + 1, offset + count + 1)]
+        },
+    }
+
+
+def check(check_id: int, status: str = "active") -> Dict[str, Any]:
+    return {
+        "check_id": check_id,
+        "hash": f"CQ{check_id:010d}",
+        "asset": "USDT",
+        "amount": "5",
+        "bot_check_url": f"https://t.me/CryptoBot?start=CQ{check_id:010d}",
+        "status": status,
+        "created_at": iso(EPOCH + timedelta(minutes=check_id)),
+    }
+
+
+def transfer(
+    transfer_id: int, user_id: int = 1, spend_id: str = None
+) -> Dict[str, Any]:
+    data = {
+        "transfer_id": transfer_id,
+        "user_id": user_id,
+        "asset": "USDT",
+        "amount": "5",
+        "status": "completed",
+        "completed_at": iso(EPOCH + timedelta(minutes=transfer_id)),
+        "comment": f"Payout #{transfer_id}",
+    }
+    if spend_id is not None:
+        data["spend_id"] = spend_id
+    return data
+
+
+def update(update_id: int, invoice_id: int = None) -> Dict[str, Any]:
+    invoice_id = update_id if invoice_id is None else invoice_id
+    return {
+        "update_id": update_id,
+        "update_type": "invoice_paid",
+        "request_date": iso(EPOCH + timedelta(minutes=invoice_id, seconds=150)),
+        "payload": invoice(invoice_id, "paid"),
+    }
+
+
+PROFILE = {
+    "app_id": 17,
+    "name": "Benchmark shop",
+    "payment_processing_bot_username": "CryptoTestnetBot",
+}
+
+ASSETS = ["USDT", "TON", "BTC", "ETH", "LTC", "BNB", "TRX", "USDC"]
+FIATS = ["USD", "EUR", "RUB"]
+RATES_TO_USD = {
+    "USDT": "1.0001",
+    "TON": "5.21",
+    "BTC": "63210.5",
+    "ETH": "3050.2",
+    "LTC": "81.4",
+    "BNB": "590.3",
+    "TRX": "0.12",
+    "USDC": "0.9999",
+}
+USD_TO_FIAT = {"USD": 1, "EUR": 0.93, "RUB": 91.5}
+
+
+def balances() -> List[Dict[str, Any]]:
+    return [
+        {"currency_code": asset, "available": "1000.5", "onhold": "0"}
+        for asset in ASSETS
+    ]
+
+
+def currencies() -> List[Dict[str, Any]]:
+    return [
+        {
+            "is_blockchain": True,
+            "is_stablecoin": asset in ("USDT", "USDC"),
+            "is_fiat": False,
+            "name": asset,
+            "code": asset,
+            "decimals": 8,
+        }
+        for asset in ASSETS
+    ] + [
+        {
+            "is_blockchain": False,
+            "is_stablecoin": False,
+            "is_fiat": True,
+            "name": fiat,
+            "code": fiat,
+            "decimals": 2,
+        }
+        for fiat in FIATS
+    ]
+
+
+def exchange_rates() -> List[Dict[str, Any]]:
+    return [
+        {
+            "is_valid": True,
+            "is_crypto": True,
+            "is_fiat": False,
+            "source": asset,
+            "target": fiat,
+            "rate": str(round(float(rate) * USD_TO_FIAT[fiat], 8)),
+        }
+        for asset, rate in RATES_TO_USD.items()
+        for fiat in FIATS
+    ]
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "volume": 15430.5,
+        "conversion": 0.42,
+        "unique_users_count": 310,
+        "created_invoice_count": 1200,
+        "paid_invoice_count": 504,
+        "start_at": iso(EPOCH),
+        "end_at": iso(EPOCH + timedelta(days=1)),
+    }
@@ -0,0 +1,301 @@
+"""
+Local stand-in of the Crypto Pay API for benchmarks.
+
+    python -m benchmarks.server [--port 8080] [--latency 0.05] [--error-rate 0.01]
+
+Serves every API method with realistic payloads from an in-memory store.
+Each request is delayed by `latency` plus random `jitter` seconds, and a
+share of requests given by `error_rate` fails with `error_status`.
+Point the client to it with `AioCryptoPay(token, network=server.url)`.
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from aiohttp import web
+
+from . import payloads
+
+
+MAX_COUNT = 1000
+
+ERROR_NAMES = {
+    400: "BAD_REQUEST",
+    401: "UNAUTHORIZED",
+    404: "METHOD_NOT_FOUND",
+    429: "TOO_MANY_REQUESTS",
+    500: "INTERNAL_ERROR",
+    502: "BAD_GATEWAY",
+    503: "SERVICE_UNAVAILABLE",
+}
+
+
+class APIError(Exception):
+    def __init__(self, code: int, name: str) -> None:
+        super().__init__(code, name)
+        self.code = code
+        self.name = name
+
+
+class StandInServer:
+    """In-memory Crypto Pay API served by aiohttp"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token: Optional[str] = None,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        error_status: int = 500,
+        invoices: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Init server
+            :param host: interface to listen on
+            :param port: port to listen on, 0 picks a free one
+            :param token: API token to require, any token is accepted by default
+            :param latency: seconds every response is delayed by
+            :param jitter: max extra random delay in seconds
+            :param error_rate: share of requests failing with `error_status`, from 0 to 1
+            :param error_status: HTTP status of injected errors. 429 responses carry Retry-After: 0.
+            :param invoices: number of invoices created on start
+            :param seed: random seed of jitter and injected errors
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._invoices: Dict[int, Dict[str, Any]] = {}
+        self._checks: Dict[int, Dict[str, Any]] = {}
+        self._transfers: Dict[int, Dict[str, Any]] = {}
+        self._spend_ids: Dict[str, int] = {}
+        self._last_ids: Counter = Counter()
+        for _ in range(invoices):
+            self._add_invoice(payloads.invoice(self._next_id("invoice")))
+
+        self._methods: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+            "getMe": lambda params: payloads.PROFILE,
+            "getBalance": lambda params: payloads.balances(),
+            "getExchangeRates": lambda params: payloads.exchange_rates(),
+            "getCurrencies": lambda params: payloads.currencies(),
+            "getStats": lambda params: payloads.stats(),
+            "createInvoice": self.create_invoice,
+            "getInvoices": self.get_invoices,
+            "deleteInvoice": self.delete_invoice,
+            "createCheck": self.create_check,
+            "getChecks": self.get_checks,
+            "deleteCheck": self.delete_check,
+            "transfer": self.transfer,
+            "getTransfers": self.get_transfers,
+        }
+
+    @property
+    def url(self) -> str:
+        """Network address for the client"""
+        return f"http://{self.host}:{self.port}"
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/api/{method}", self.handle)
+        return app
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.requests[method] += 1
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        try:
+            if self.token is not None and (
+                request.headers.get("Crypto-Pay-API-Token") != self.token
+            ):
+                raise APIError(401, "UNAUTHORIZED")
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise APIError(
+                    self.error_status, ERROR_NAMES.get(self.error_status, "ERROR")
+                )
+            handler = self._methods.get(method)
+            if handler is None:
+                raise APIError(404, "METHOD_NOT_FOUND")
+            result = handler(await self._params(request))
+        except APIError as error:
+            self.errors[error.code] += 1
+            headers = {"Retry-After": "0"} if error.code == 429 else None
+            return self._json(
+                {"ok": False, "error": {"code": error.code, "name": error.name}},
+                status=error.code,
+                headers=headers,
+            )
+        return self._json({"ok": True, "result": result})
+
+    @staticmethod
+    async def _params(request: web.Request) -> Dict[str, Any]:
+        params: Dict[str, Any] = dict(request.query)
+        if request.can_read_body and request.content_type == "application/json":
+            params.update(await request.json())
+        return params
+
+    @staticmethod
+    def _json(
+        data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None
+    ) -> web.Response:
+        return web.Response(
+            body=json.dumps(data).encode("UTF-8"),
+            status=status,
+            headers=headers,
+            content_type="application/json",
+        )
+
+    def _next_id(self, kind: str) -> int:
+        self._last_ids[kind] += 1
+        return self._last_ids[kind]
+
+    def _add_invoice(self, invoice: Dict[str, Any]) -> Dict[str, Any]:
+        self._invoices[invoice["invoice_id"]] = invoice
+        return invoice
+
+    def create_invoice(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        if "amount" not in params:
+            raise APIError(400, "AMOUNT_REQUIRED")
+        invoice = payloads.invoice(self._next_id("invoice"), "active")
+        for key in ("asset", "amount", "description", "payload", "currency_type"):
+            if params.get(key) is not None:
+                invoice[key] = str(params[key])
+        return self._add_invoice(invoice)
+
+    def get_invoices(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        return {"items": self._select(self._invoices, params, "invoice_ids")}
+
+    def delete_invoice(self, params: Mapping[str, Any]) -> bool:
+        if self._invoices.pop(_int(params.get("invoice_id")), None) is None:
+            raise APIError(400, "INVOICE_NOT_FOUND")
+        return True
+
+    def create_check(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        check = payloads.check(self._next_id("check"))
+        self._checks[check["check_id"]] = check
+        return check
+
+    def get_checks(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        return {"items": self._select(self._checks, params, "check_ids")}
+
+    def delete_check(self, params: Mapping[str, Any]) -> bool:
+        if self._checks.pop(_int(params.get("check_id")), None) is None:
+            raise APIError(400, "CHECK_NOT_FOUND")
+        return True
+
+    def transfer(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        spend_id = params.get("spend_id")
+        if not spend_id:
+            raise APIError(400, "SPEND_ID_REQUIRED")
+        transfer_id = self._spend_ids.get(str(spend_id))
+        if transfer_id is not None:
+            return self._transfers[transfer_id]
+        transfer = payloads.transfer(
+            self._next_id("transfer"), _int(params.get("user_id")), str(spend_id)
+        )
+        self._transfers[transfer["transfer_id"]] = transfer
+        self._spend_ids[str(spend_id)] = transfer["transfer_id"]
+        return transfer
+
+    def get_transfers(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        spend_id = params.get("spend_id")
+        if spend_id is not None:
+            transfer_id = self._spend_ids.get(str(spend_id))
+            items = [self._transfers[transfer_id]] if transfer_id else []
+            return {"items": items}
+        return {"items": self._select(self._transfers, params, "transfer_ids")}
+
+    @staticmethod
+    def _select(
+        store: Dict[int, Dict[str, Any]], params: Mapping[str, Any], ids_key: str
+    ) -> List[Dict[str, Any]]:
+        ids = params.get(ids_key)
+        if ids:
+            ids = ids if isinstance(ids, list) else str(ids).split(",")
+            return [store[_int(i)] for i in ids if _int(i) in store]
+
+        items = store.values()
+        for key in ("asset", "status"):
+            if params.get(key):
+                items = [item for item in items if item.get(key) == params[key]]
+        offset = _int(params.get("offset", 0))
+        count = min(_int(params.get("count", 100)), MAX_COUNT)
+        return list(items)[offset : offset + count]
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise APIError(400, "INVALID_PARAMS")
+
+
+async def serve(server: StandInServer) -> None:
+    async with server:
+        print(f"Crypto Pay API stand-in on {server.url}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--invoices", type=int, default=1000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(
+            serve(
+                StandInServer(
+                    host=args.host,
+                    port=args.port,
+                    latency=args.latency,
+                    jitter=args.jitter,
+                    error_rate=args.error_rate,
+                    error_status=args.error_status,
+                    invoices=args.invoices,
+                )
+            )
+        )
+    except KeyboardInterrupt:
+        pass
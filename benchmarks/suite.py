@@ -0,0 +1,237 @@
+"""
+Benchmark suite against the local API stand-in.
+
+    python -m benchmarks.suite [--output results.json] [--latency 0.005] [--concurrency 50]
+
+Measures create_invoice throughput, paginated listing, parsing of large
+pages, webhook handling and import time. Results are printed as JSON
+together with the versions they were measured on, so they can be stored
+per release and compared.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+import pydantic
+from aiohttp import web
+
+import aiocryptopay
+from aiocryptopay import AioCryptoPay
+
+from . import import_time, parse_models, payloads
+from .server import StandInServer
+
+
+TOKEN = "1337:benchmark"
+
+
+def summarize(
+    latencies: List[float], elapsed: float, errors: int = 0
+) -> Dict[str, Any]:
+    """Throughput and latency percentiles of a run"""
+    latencies = sorted(latencies)
+    quantiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "per_second": round((len(latencies) + errors) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else None,
+    }
+
+
+async def run_concurrently(
+    call: Callable[[int], Awaitable[Any]], total: int, concurrency: int
+) -> Dict[str, Any]:
+    """Run `call(index)` `total` times with at most `concurrency` in flight"""
+    latencies: List[float] = []
+    errors = 0
+    indexes = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            started_at = time.perf_counter()
+            try:
+                await call(index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started_at, errors)
+
+
+async def bench_create_invoice(
+    server: StandInServer, total: int, concurrency: int
+) -> Dict[str, Any]:
+    async with AioCryptoPay(TOKEN, network=server.url) as crypto:
+        await crypto.warmup(connections=min(concurrency, 10))
+
+        async def call(index: int) -> None:
+            await crypto.create_invoice(
+                amount=12.5, asset="USDT", description=f"Order #{index}"
+            )
+
+        return await run_concurrently(call, total, concurrency)
+
+
+async def bench_pagination(
+    server: StandInServer, page_size: int, trusted: bool
+) -> Dict[str, Any]:
+    async with AioCryptoPay(TOKEN, network=server.url, trusted=trusted) as crypto:
+        started_at = time.perf_counter()
+        invoices = 0
+        async for invoice in crypto.iter_invoices(count=page_size):
+            invoice.invoice_id
+            invoices += 1
+        elapsed = time.perf_counter() - started_at
+    return {
+        "invoices": invoices,
+        "page_size": page_size,
+        "elapsed_s": round(elapsed, 4),
+        "invoices_per_second": round(invoices / elapsed, 1),
+    }
+
+
+def sign(body: bytes, token: str = TOKEN) -> str:
+    secret = hashlib.sha256(token.encode("UTF-8")).digest()
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+async def bench_webhook(
+    total: int, concurrency: int, dispatch_workers: Optional[int]
+) -> Dict[str, Any]:
+    crypto = AioCryptoPay(TOKEN, dispatch_workers=dispatch_workers)
+    handled = 0
+
+    @crypto.pay_handler()
+    async def on_paid(update, app) -> None:
+        nonlocal handled
+        handled += 1
+
+    app = web.Application()
+    app.router.add_post("/webhook", crypto.get_updates)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/webhook"
+
+    bodies = [
+        json.dumps(payloads.update(update_id)).encode("UTF-8")
+        for update_id in range(1, total + 1)
+    ]
+    signatures = [sign(body) for body in bodies]
+
+    async with aiohttp.ClientSession() as session:
+
+        async def call(index: int) -> None:
+            async with session.post(
+                url,
+                data=bodies[index],
+                headers={
+                    "Crypto-Pay-Api-Signature": signatures[index],
+                    "Content-Type": "application/json",
+                },
+            ) as response:
+                response.raise_for_status()
+
+        result = await run_concurrently(call, total, concurrency)
+
+    await crypto.close()
+    await runner.cleanup()
+    result["handled"] = handled
+    return result
+
+
+async def run_network_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    server = StandInServer(
+        token=TOKEN,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        invoices=args.invoices,
+        seed=0,
+    )
+    async with server:
+        results["create_invoice"] = await bench_create_invoice(
+            server, args.requests, args.concurrency
+        )
+        results["pagination"] = {
+            "validated": await bench_pagination(server, args.page_size, False),
+            "trusted": await bench_pagination(server, args.page_size, True),
+        }
+    results["webhook"] = {
+        "inline": await bench_webhook(args.requests, args.concurrency, None),
+        "dispatched": await bench_webhook(args.requests, args.concurrency, 4),
+    }
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "aiocryptopay": aiocryptopay.__version__,
+        "aiohttp": aiohttp.__version__,
+        "pydantic": pydantic.VERSION,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", help="write JSON results to the file")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--invoices", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_network_benchmarks(args))
+    results["parse_page"] = parse_models.run(count=args.page_size)
+    results["import_time"] = min(
+        (import_time.measure() for _ in range(3)), key=lambda run: run["own_ms"]
+    )
+
+    report = {
+        "environment": environment(),
+        "settings": vars(args),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as file:
+            file.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
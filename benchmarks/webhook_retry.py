@@ -0,0 +1,73 @@
+"""
+Check that a webhook retry after a failed handler is processed again.
+
+    python -m benchmarks.webhook_retry
+
+The first delivery of an update fails in the handler and gets 500, the retry
+must run the handler again and get 200. Exits with 1 if the retry was acked
+as a duplicate, and checks that a retry of a handled update is still skipped.
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from aiocryptopay import AioCryptoPay
+
+from . import payloads
+from .suite import TOKEN, sign
+
+
+async def run() -> Dict[str, Any]:
+    crypto = AioCryptoPay(TOKEN)
+    calls: List[int] = []
+
+    @crypto.pay_handler()
+    async def on_paid(update, app) -> None:
+        calls.append(update.update_id)
+        if len(calls) == 1:
+            raise RuntimeError("handler failed")
+
+    app = web.Application()
+    app.router.add_post("/webhook", crypto.get_updates)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/webhook"
+
+    body = json.dumps(payloads.update(7)).encode("UTF-8")
+    statuses = []
+    try:
+        async with aiohttp.ClientSession() as session:
+            # Failed delivery, its retry and a retry of the handled update
+            for _ in range(3):
+                async with session.post(
+                    url,
+                    data=body,
+                    headers={
+                        "Crypto-Pay-Api-Signature": sign(body),
+                        "Content-Type": "application/json",
+                    },
+                ) as response:
+                    statuses.append(response.status)
+    finally:
+        await crypto.close()
+        await runner.cleanup()
+    return {"statuses": statuses, "handler_calls": calls, "dedup": crypto.dedup_stats}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    result = asyncio.run(run())
+    print(json.dumps(result))
+    if result["statuses"] != [500, 200, 200] or result["handler_calls"] != [7, 7]:
+        print("retry of a failed update was not processed again", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())